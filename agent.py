@@ -11,16 +11,22 @@ import os
 import json
 import re
 import inspect
+import threading
 import time
 import google.generativeai as genai
 # from api import OpenStackAPI
 from fake_api import FakeOpenStackAPI as OpenStackAPI
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 # Configuration
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
+# Seconds a read-only query's result is reused for an identical query (0 disables). The cache is
+# per process: a write clears it only in the agent that made it, so with several web workers another
+# worker's reads can be up to this stale. Set it to 0 when that matters.
+QUERY_CACHE_TTL = float(os.environ.get("QUERY_CACHE_TTL", "10"))
+READ_ONLY_PREFIXES = ('list_', 'get_')
 
 DEFAULT_PARAMS_MAP = {
     'create_server': {
@@ -62,6 +68,9 @@ class OpenStackAgent:
         self.default_params_map = DEFAULT_PARAMS_MAP
         self.last_execution_time = None
         self.api_methods = self._get_api_methods()
+        # normalized query -> (expires_at, result), only for read-only functions
+        self._query_cache: Dict[str, Tuple[float, Any]] = {}
+        self._query_cache_lock = threading.Lock()
         print("Agent initialized.")
 
     def _get_api_methods(self) -> Dict[str, Dict[str, Any]]:
@@ -249,6 +258,15 @@ class OpenStackAgent:
 
     def process_user_query(self, user_query: str) -> Optional[Any]:
         """Processes user query, generates command, validates, collects params, and then calls execute_command."""
+        # Whitespace-normalized only; resource names are case-sensitive
+        cache_key = " ".join(user_query.split()) if isinstance(user_query, str) else None
+        if cache_key and QUERY_CACHE_TTL > 0:
+            with self._query_cache_lock:
+                cached = self._query_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                print(f"Using cached result for: {user_query}")
+                return cached[1]
+
         initial_intent = self._generate_initial_command_with_ai(user_query)
         if not initial_intent or initial_intent.get('function_name') == 'clarify':
             print("Unclear request or AI generation failed. Please provide more details or rephrase.")
@@ -306,7 +324,20 @@ class OpenStackAgent:
             "parameters": final_params
         }
         
-        return self.execute_command(command_to_execute)
+        result = self.execute_command(command_to_execute)
+        if cache_key and QUERY_CACHE_TTL > 0:
+            now = time.monotonic()
+            with self._query_cache_lock:
+                if final_function_name.startswith(READ_ONLY_PREFIXES):
+                    # Failures (None or an "Error: ..." string) are retried on the next call, not replayed
+                    failed = result is None or (isinstance(result, str) and result.startswith("Error:"))
+                    if not failed and not params_to_prompt_for_details:
+                        self._query_cache = {k: v for k, v in self._query_cache.items() if v[0] > now}
+                        self._query_cache[cache_key] = (now + QUERY_CACHE_TTL, result)
+                else:
+                    # Anything else may change what this agent's cached reads would return
+                    self._query_cache.clear()
+        return result
 
     def execute_command(self, command: Dict[str, Any]) -> Optional[Any]:
         """Executes the OpenStack command after consent and parameter finalization."""
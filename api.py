@@ -10,6 +10,7 @@ import openstack
 import os
 import time
 from typing import Optional, Tuple, Dict, Any, List
+from requests.adapters import HTTPAdapter
 
 # --- Load OpenStack Credentials ---
 # It's recommended to use environment variables
@@ -21,6 +22,10 @@ OS_PROJECT_ID = os.environ.get("OS_PROJECT_ID")
 OS_USER_DOMAIN_NAME = os.environ.get("OS_USER_DOMAIN_NAME")
 OS_PROJECT_DOMAIN_NAME = os.environ.get("OS_PROJECT_DOMAIN_NAME")
 
+# Keep-alive pool on the SDK's HTTP session, sized for concurrent web requests sharing one connection
+HTTP_POOL_CONNECTIONS = int(os.environ.get("OS_HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("OS_HTTP_POOL_MAXSIZE", "50"))
+
 
 class OpenStackAPI:
     """Main API class for OpenStack operations."""
@@ -29,8 +34,15 @@ class OpenStackAPI:
         """Initialize the OpenStack connection."""
         self.conn = None
     
+    def is_connected(self) -> bool:
+        """Check whether a connection has been established."""
+        return self.conn is not None
+    
     def connect(self) -> bool:
         """Connect to OpenStack and return connection status."""
+        if self.conn:
+            # Reuse the existing session (and its pooled TLS connections) instead of re-authenticating
+            return True
         try:
             print(f"Attempting to connect to OpenStack at: {OS_AUTH_URL}")
             self.conn = openstack.connect(
@@ -41,6 +53,9 @@ class OpenStackAPI:
                 user_domain_name=OS_USER_DOMAIN_NAME,
                 project_domain_name=OS_PROJECT_DOMAIN_NAME,
             )
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+            self.conn.session.session.mount("https://", adapter)
+            self.conn.session.session.mount("http://", adapter)
             print("OpenStack Connection Successful!")
             return True
         except Exception as e:
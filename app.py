@@ -1,17 +1,22 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from typing import Dict
+import logging
 import os
 
 # Import OpenStack connection logic
 from openstack_manager import connect_to_openstack, create_server
 
+# openstack_manager logs progress at INFO/DEBUG; keep it quiet in production unless LOG_LEVEL says otherwise
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"))
+
 app = FastAPI()
 
 # Initialize OpenStack connection once
 openstack_conn = connect_to_openstack()
 
-@app.get("/")
+@app.get("/", response_model=Dict[str, str])
 def home():
     return {"message": "OpenStack Agent is running!"}
 
@@ -5,23 +5,36 @@ Combines api.py, agent.py, and runner.py functionality.
 """
 
 import argparse
+import atexit
+import contextlib
+import io
 import sys
 import json
 import re
+import reprlib
 import os
 import time
-from collections import deque
+import threading
+from collections import deque, OrderedDict
+from itertools import islice
 from datetime import datetime
 import logging
+import logging.handlers
+import queue
 from typing import Optional, Tuple, Dict, Any, List, Callable
 
-import openstack # From api.py
-import requests # From runner.py
-from flask import Flask, request, jsonify # From runner.py
-from flask_cors import CORS # From runner.py
-import google.generativeai as genai # From agent.py
 import inspect # From agent.py
 
+# Prefer orjson for parsing JSON when available; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson as _json_fast
+    # json.dumps turns int/float/bool/None keys into strings; orjson rejects them without this option
+    _JSON_FAST_DUMPS_OPTION = _json_fast.OPT_NON_STR_KEYS
+except ImportError:
+    _json_fast = json
+    _JSON_FAST_DUMPS_OPTION = None
+_JSON_DECODER = json.JSONDecoder() # Incremental parsing of streamed model output
+
 # Attempt to import Rich for a better CLI experience
 try:
     from rich.console import Console
@@ -81,12 +94,13 @@ except ImportError:
         def add_row(self, *args):
             self.rows.append(args)
         def __str__(self):
-            output = f"{self.title}\n" if self.title else ""
-            output += " | ".join(self.columns) + "\n"
-            output += "-" * (len(output) - 1) + "\n"
-            for row in self.rows:
-                output += " | ".join(str(cell) for cell in row) + "\n"
-            return output
+            # Collect the lines and join once rather than growing a string per row
+            header = " | ".join(self.columns)
+            lines = [self.title] if self.title else []
+            lines += [header, "-" * len(header)]
+            lines.extend(" | ".join(str(cell) for cell in row) for row in self.rows)
+            lines.append("")
+            return "\n".join(lines)
 
 # --- Credential Management ---
 def get_openstack_credentials():
@@ -158,12 +172,35 @@ OS_CREDENTIALS = get_openstack_credentials()
 class OpenStackAPI:
     """Main API class for OpenStack operations."""
     
+    # Every instance uses the same credentials, so one authenticated connection is shared process-wide
+    # (e.g. by all pooled web agents) instead of each instance running its own auth handshake.
+    _shared_conn = None
+    _connect_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize the OpenStack connection."""
         self.conn = None
         self.credentials = OS_CREDENTIALS # Use credentials fetched at startup
     
     def connect(self) -> bool:
+        """Connect to OpenStack, reusing this process's verified connection when there is one."""
+        with OpenStackAPI._connect_lock:
+            if OpenStackAPI._shared_conn is not None:
+                self.conn = OpenStackAPI._shared_conn
+                return True
+            connected = self._connect()
+            if connected:
+                OpenStackAPI._shared_conn = self.conn
+            return connected
+    
+    def _disconnect(self):
+        """Drop the shared connection so the next connect() authenticates again."""
+        with OpenStackAPI._connect_lock:
+            if OpenStackAPI._shared_conn is self.conn:
+                OpenStackAPI._shared_conn = None
+        self.conn = None
+    
+    def _connect(self) -> bool:
         """Connect to OpenStack and return connection status."""
         # Check if essential credentials are set before attempting to connect
         essential_creds = ["OS_AUTH_URL", "OS_USERNAME", "OS_PASSWORD", "OS_PROJECT_NAME", "OS_USER_DOMAIN_NAME", "OS_PROJECT_DOMAIN_NAME"]
@@ -171,6 +208,9 @@ class OpenStackAPI:
             missing_details = [key for key in essential_creds if not self.credentials.get(key)]
             console.print(f"[bold red]Essential OpenStack credentials missing: {', '.join(missing_details)}. Cannot attempt connection.[/bold red]")
             return False
+        # Imported here so CLI start-up (help, tutorial, remote mode) doesn't pay for the SDK import
+        import openstack
+        import requests
         try:
             console.print(f"[cyan]Attempting to connect to OpenStack at: {self.credentials['OS_AUTH_URL']}...[/cyan]")
             self.conn = openstack.connect(
@@ -182,6 +222,10 @@ class OpenStackAPI:
                 project_domain_name=self.credentials['OS_PROJECT_DOMAIN_NAME'],
                 project_id=self.credentials.get('OS_PROJECT_ID') # project_id can be None
             )
+            # Reuse pooled keep-alive connections for every call made through this session
+            pooled_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            self.conn.session.session.mount("https://", pooled_adapter)
+            self.conn.session.session.mount("http://", pooled_adapter)
             # Verify connection by trying a simple read operation
             try:
                 self.conn.identity.projects() # Check if we can list projects
@@ -800,30 +844,85 @@ DEFAULT_PARAMS_MAP = {
     },
 }
 
+# Converters for values typed at parameter prompts, keyed by the parameter's type string
+TRUE_STRINGS = frozenset({"true", "yes", "1", "y"})
+PARAM_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "float": float,
+    "bool": lambda value: value.lower() in TRUE_STRINGS,
+    "str": str,
+}
+# _get_api_methods stringifies annotations, e.g. "<class 'int'>", so accept that spelling too
+PARAM_CONVERTERS.update({str(t): PARAM_CONVERTERS[t.__name__] for t in (int, float, bool, str)})
+
+# Queries this short with no back-references skip Layer-2 validation when Layer 1 is complete
+SIMPLE_QUERY_MAX_WORDS = 6
+AMBIGUOUS_REFERENCES = frozenset({"it", "that", "this", "them", "first", "second", "last"})
+
+# Optional offline-trained classifier that predicts Layer-2 'is_valid' from cheap query features.
+# When it is confident enough the LLM validation call is skipped. Both settings are opt-in: the
+# classifier is unpickled, so only point VALIDATOR_CLF_PATH at a file you trust, and LLM verdicts are
+# appended to VALIDATION_LOG_PATH (for (re)training) only while collecting data.
+VALIDATOR_CLF_PATH = os.environ.get("VALIDATOR_CLF_PATH")
+VALIDATOR_SKIP_THRESHOLD = 0.95
+VALIDATION_LOG_PATH = os.environ.get("VALIDATION_LOG_PATH")
+# API functions that never change OpenStack state; only their web responses are cached
+READ_ONLY_FUNCTIONS = frozenset({
+    'list_servers', 'list_images', 'list_flavors', 'list_networks', 'list_volumes',
+    'get_server_details', 'get_usage',
+})
+OUTPUT_FORMAT_PATTERN = re.compile(r"format\s+(pretty|json|raw)")
+UUID_PATTERN = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE)
+
 if not GOOGLE_API_KEY:
     print("Warning: GOOGLE_API_KEY not set in environment variables. AI functionality will be limited or fail.")
     # Provide a way for the user to input it, or use a default/placeholder if appropriate for the context
     # For now, we'll let it proceed, but genai.configure might fail or functionalities will be impacted.
     # GOOGLE_API_KEY = "YOUR_FALLBACK_API_KEY_OR_PROMPT_LOGIC_HERE"
 
-# Configure Google AI (genai) if API key is available
-if GOOGLE_API_KEY:
-    try:
-        genai.configure(api_key=GOOGLE_API_KEY)
-    except Exception as e:
-        print(f"Error configuring Google AI: {e}. AI features may not work.")
-else:
+_genai = None
+
+def _get_genai():
+    """Imports and configures google.generativeai on first use; returns None if it can't be configured."""
+    global _genai
+    if _genai is None and GOOGLE_API_KEY:
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=GOOGLE_API_KEY)
+            _genai = genai
+        except Exception as e:
+            print(f"Error configuring Google AI: {e}. AI features may not work.")
+    return _genai
+
+MODEL_NAME = 'gemma-3-27b-it'
+VALIDATION_MODEL_NAME = MODEL_NAME
+# GenerativeModel handles are stateless clients, so every agent shares one per model name
+_MODEL_SINGLETONS: Dict[str, Any] = {}
+
+def _get_model(name: str):
+    """Returns the shared GenerativeModel for name, creating it on first use."""
+    model = _MODEL_SINGLETONS.get(name)
+    if model is None:
+        model = _MODEL_SINGLETONS[name] = _get_genai().GenerativeModel(name)
+    return model
+
+if not GOOGLE_API_KEY:
     print("Google AI not configured as GOOGLE_API_KEY is missing.")
 
 class OpenStackAgent:
     """The AI agent to interact with OpenStack."""
 
-    def __init__(self):
+    # Bumped after every call that may change OpenStack state; shared by all agents in the process
+    # (not across worker processes - see RESPONSE_CACHE_TTL)
+    state_version = 0
+
+    def __init__(self, strict_validate: bool = False):
         self.openstack_api = OpenStackAPI() # Uses the consolidated OpenStackAPI
-        if GOOGLE_API_KEY: # Initialize model only if API key is present and configured
+        self.strict_validate = strict_validate # Always run Layer-2 validation when True
+        if _get_genai(): # Initialize model only if API key is present and configured
             try:
-                self.model = genai.GenerativeModel('gemma-3-27b-it') # Consider making model configurable
-                self.validation_model = self.model
+                self.model = _get_model(MODEL_NAME)
+                self.validation_model = _get_model(VALIDATION_MODEL_NAME)
             except Exception as e:
                 print(f"Failed to initialize GenerativeModel: {e}. AI features will be impacted.")
                 self.model = None
@@ -836,8 +935,43 @@ class OpenStackAgent:
         self.default_params_map = DEFAULT_PARAMS_MAP
         self.last_execution_time = None
         self.api_methods = self._get_api_methods()
+        # Required parameter names per function, in signature order so prompts stay ordered
+        self._required_by_fn: Dict[str, Tuple[str, ...]] = {
+            fn: tuple(name for name, details in method['params'].items() if details['required'])
+            for fn, method in self.api_methods.items()
+        }
+        self._function_ids = {name: index for index, name in enumerate(self.api_methods)}
+        self._valid_clf = self._load_validation_classifier()
+        # Authenticate once and keep the session; it is only dropped again on a 401.
+        self._connected = False
+        self._ensure_openstack_connection()
         print("Agent initialized.")
 
+    def _load_validation_classifier(self):
+        """Loads the optional Layer-2 classifier; returns None when it is not configured or available."""
+        if not VALIDATOR_CLF_PATH:
+            return None
+        if not os.path.exists(VALIDATOR_CLF_PATH):
+            print(f"Validation classifier {VALIDATOR_CLF_PATH} not found; using AI validation only.")
+            return None
+        try:
+            import joblib
+            return joblib.load(VALIDATOR_CLF_PATH)
+        except Exception as e:
+            print(f"Could not load validation classifier from {VALIDATOR_CLF_PATH}: {e}")
+            return None
+
+    def _ensure_openstack_connection(self) -> bool:
+        """Connects to OpenStack on first use and reuses the session afterwards."""
+        if not self._connected:
+            self._connected = self.openstack_api.connect()
+        return self._connected
+
+    def _invalidate_openstack_connection(self):
+        """Drops the cached session so the next command re-authenticates."""
+        self._connected = False
+        self.openstack_api._disconnect()
+
     def _get_api_methods(self) -> Dict[str, Dict[str, Any]]:
         """Inspects OpenStackAPI to find public methods and their parameters."""
         methods = {}
@@ -1143,16 +1277,33 @@ class OpenStackAgent:
     def _parse_json_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """Parses JSON response from AI."""
         try:
-            return json.loads(response_text.strip())
+            return _json_fast.loads(response_text.strip())
         except json.JSONDecodeError:
             match = re.search(r"```json\s*(.*?)\s*```", response_text, re.DOTALL)
             if match:
                 try:
-                    return json.loads(match.group(1))
+                    return _json_fast.loads(match.group(1))
                 except json.JSONDecodeError as e:
                     print(f"JSON parse failed after fix: {e}")
             return None
 
+    def _stream_json_response(self, model, prompt: str) -> Optional[Dict[str, Any]]:
+        """Streams a model response and returns as soon as a complete JSON object has arrived."""
+        buffer = io.StringIO()
+        for chunk in model.generate_content(prompt, stream=True):
+            buffer.write(chunk.text)
+            text = buffer.getvalue()
+            start = text.find("{")
+            if start == -1:
+                continue
+            try:
+                parsed, _ = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(parsed, dict):
+                return parsed # Stop consuming the stream; the rest is trailing text
+        return self._parse_json_response(buffer.getvalue())
+
     def _generate_initial_command_with_ai(self, user_query: str) -> Dict[str, Any]:
         """Generates initial command using AI."""
         if not self.model:
@@ -1160,23 +1311,60 @@ class OpenStackAgent:
             return {"function_name": "clarify", "parameters": {"error": "AI model not initialized"}}
         prompt = self._generate_ai_prompt(user_query)
         try:
-            response = self.model.generate_content(prompt)
-            parsed = self._parse_json_response(response.text)
+            parsed = self._stream_json_response(self.model, prompt)
             return parsed if parsed else {"function_name": "clarify", "parameters": {}}
         except Exception as e:
             print(f"AI error (Layer 1): {e}")
             return {"function_name": "clarify", "parameters": {}}
 
+    def _validation_features(self, user_query: str, generated_command: Dict[str, Any]) -> List[float]:
+        """Builds the feature vector used by the local Layer-2 classifier."""
+        function_name = generated_command.get('function_name')
+        params = generated_command.get('parameters') or {}
+        return [
+            len(user_query),
+            self._function_ids.get(function_name, -1),
+            len(params),
+            len(self._get_missing_parameters(function_name, params)),
+            1 if UUID_PATTERN.search(user_query) else 0,
+        ]
+
+    def _predict_valid_probability(self, features: Optional[List[float]]) -> float:
+        """Returns the classifier's probability that the command is valid, or 0.0 without features or a classifier."""
+        if features is None or self._valid_clf is None or self.strict_validate:
+            return 0.0
+        try:
+            return float(self._valid_clf.predict_proba([features])[0][1])
+        except Exception as e:
+            print(f"Validation classifier failed, falling back to AI validation: {e}")
+            return 0.0
+
+    def _record_validation_decision(self, features: List[float], is_valid: bool):
+        """Appends an LLM validation verdict to the training log for the local classifier."""
+        try:
+            with open(VALIDATION_LOG_PATH, 'a') as f:
+                f.write(json.dumps({"features": features, "is_valid": bool(is_valid)}) + "\n")
+        except OSError as e:
+            print(f"Could not record validation decision: {e}")
+
     def _validate_command_with_ai(self, user_query: str, generated_command: Dict[str, Any]) -> Dict[str, Any]:
         """Validates the command."""
         if not self.validation_model:
             print("AI model not available for validating command.")
             return {"is_valid": False, "feedback": "AI model not initialized for validation.", "missing_parameters_based_on_intent": [], "suggested_corrections": {}}
+        # Features are only needed by a usable classifier or the training log
+        use_classifier = self._valid_clf is not None and not self.strict_validate
+        features = (self._validation_features(user_query, generated_command)
+                    if use_classifier or VALIDATION_LOG_PATH else None)
+        valid_probability = self._predict_valid_probability(features)
+        if valid_probability > VALIDATOR_SKIP_THRESHOLD:
+            return {"is_valid": True, "feedback": f"Predicted valid by local classifier (p={valid_probability:.2f}).", "missing_parameters_based_on_intent": [], "suggested_corrections": {}}
         prompt = self._generate_validation_prompt(user_query, generated_command)
         try:
-            response = self.validation_model.generate_content(prompt)
-            parsed = self._parse_json_response(response.text)
+            parsed = self._stream_json_response(self.validation_model, prompt)
             if parsed and "is_valid" in parsed:
+                if VALIDATION_LOG_PATH:
+                    self._record_validation_decision(features, parsed["is_valid"])
                 parsed.setdefault("feedback", "")
                 parsed.setdefault("missing_parameters_based_on_intent", [])
                 parsed.setdefault("suggested_corrections", {})
@@ -1188,15 +1376,23 @@ class OpenStackAgent:
 
     def _get_missing_parameters(self, function_name: str, provided_params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Identifies missing or None-valued required parameters."""
-        missing = {}
-        if function_name not in self.api_methods:
+        required = self._required_by_fn.get(function_name)
+        if not required:
             return {}
-        required_params = self.api_methods[function_name]['params']
-        for param_name, details in required_params.items():
-            if details['required']:
-                if param_name not in provided_params or provided_params[param_name] is None:
-                    missing[param_name] = details
-        return missing
+        param_details = self.api_methods[function_name]['params']
+        return {name: param_details[name] for name in required if provided_params.get(name) is None}
+
+    def _can_skip_validation(self, user_query: str, initial_intent: Dict[str, Any]) -> bool:
+        """Checks whether a Layer-1 intent is simple and complete enough to skip the Layer-2 LLM call."""
+        if self.strict_validate:
+            return False
+        function_name = initial_intent.get('function_name')
+        if function_name not in self.api_methods:
+            return False
+        if self._get_missing_parameters(function_name, initial_intent.get('parameters', {})):
+            return False
+        words = user_query.lower().split()
+        return len(words) <= SIMPLE_QUERY_MAX_WORDS and AMBIGUOUS_REFERENCES.isdisjoint(words)
 
     def _prompt_for_parameters(self, function_name: str, missing_params: Dict[str, Dict[str, Any]], current_params: Dict[str, Any]) -> Dict[str, Any]:
         """Prompts user for missing parameters."""
@@ -1216,12 +1412,7 @@ class OpenStackAgent:
                         console.print(f"    No default for '{name}'. Please specify.")
                 elif value:
                     try:
-                        if details['type'] == 'int':
-                            collected[name] = int(value)
-                        elif details['type'] == 'bool': # Basic bool conversion
-                            collected[name] = value.lower() in ['true', 'yes', '1', 'y']
-                        else:
-                            collected[name] = value
+                        collected[name] = PARAM_CONVERTERS.get(details['type'], str)(value)
                         break
                     except ValueError:
                         console.print(f"    Please enter a valid {details['type']}.")
@@ -1250,7 +1441,10 @@ class OpenStackAgent:
 
         print(f"\nLayer 1 - Function: {initial_intent.get('function_name')}, Parameters: {initial_intent.get('parameters')}")
 
-        validation = self._validate_command_with_ai(user_query, initial_intent)
+        if self._can_skip_validation(user_query, initial_intent):
+            validation = {"is_valid": True, "feedback": "Skipped: simple query with all required parameters.", "missing_parameters_based_on_intent": [], "suggested_corrections": {}}
+        else:
+            validation = self._validate_command_with_ai(user_query, initial_intent)
         print(f"Layer 2 - Valid: {validation.get('is_valid')}, Feedback: {validation.get('feedback')}")
         print(f"Missing by Intent: {validation.get('missing_parameters_based_on_intent')}")
         print(f"Suggested Corrections: {validation.get('suggested_corrections')}")
@@ -1258,10 +1452,10 @@ class OpenStackAgent:
         final_function_name = initial_intent['function_name']
         final_params = initial_intent.get('parameters', {}).copy()
 
-        if validation.get("suggested_corrections"):
-            for param, value in validation.get("suggested_corrections").items():
-                if not str(value).startswith("Please provide"): # Ensure value is string for startswith
-                    final_params[param] = value
+        suggestions = validation.get("suggested_corrections") or {}
+        for param, value in suggestions.items():
+            if not (isinstance(value, str) and value.startswith("Please provide")):
+                final_params[param] = value
         
         # Handle missing parameters based on AI's understanding of intent
         # This part is tricky; for web, we might want to return these missing params to the UI
@@ -1307,7 +1501,7 @@ class OpenStackAgent:
                 return None # Or raise an exception for CLI
 
         print(f"\nExecuting {final_function_name} with parameters: {final_params}")
-        if not self.openstack_api.connect(): # Ensure connection before executing
+        if not self._ensure_openstack_connection(): # Reuses the session opened at startup
             connect_error = "Failed to connect to OpenStack."
             print(connect_error)
             if is_web:
@@ -1321,7 +1515,11 @@ class OpenStackAgent:
                 filtered_params = {k: v for k, v in final_params.items() if k in accepted_params_spec}
                 
                 start_time = time.time()
-                output = api_function(**filtered_params)
+                try:
+                    output = api_function(**filtered_params)
+                finally:
+                    if final_function_name not in READ_ONLY_FUNCTIONS:
+                        OpenStackAgent.state_version += 1 # Invalidates cached web responses
                 self.last_execution_time = time.time() - start_time
                 
                 success_msg = f"Command '{final_function_name}' executed successfully."
@@ -1331,13 +1529,14 @@ class OpenStackAgent:
                 print(f"Time: {self.last_execution_time:.2f} seconds")
                 
                 if is_web:
-                    return {'status': 'success', 'result': output, 'execution_time': self.last_execution_time}
+                    return {'status': 'success', 'result': output, 'execution_time': self.last_execution_time, 'function_name': final_function_name}
                 return output
             except Exception as e:
                 exec_error = f"Execution failed for '{final_function_name}': {e}"
                 print(f"\n{exec_error}")
-                if "401" in str(e):
+                if getattr(e, 'status_code', None) == 401 or "401" in str(e): # openstack HttpException carries status_code
                     print("Authentication error (HTTP 401). Please verify your OpenStack credentials.")
+                    self._invalidate_openstack_connection() # Next command reconnects lazily
                 if is_web:
                     return {'status': 'error', 'message': exec_error}
                 return None # Or raise for CLI
@@ -1357,17 +1556,21 @@ class ChatbotConfig:
         self.verbose = False
         self.output_format = "pretty"  # Options: pretty, json, raw
         self.language = "en"
+        self.strict_validate = False  # Always run Layer-2 AI validation, even for simple queries
+        self.show_spinner = True  # Animated status while a command runs (terminals only)
         self.load_config()
 
     def load_config(self):
         config_file = "chatbot_config.json" # This will be relative to where consolidated_chatbot.py is run
         if os.path.exists(config_file):
             try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
+                with open(config_file, 'rb') as f:
+                    config = _json_fast.loads(f.read())
                     self.verbose = config.get("verbose", False)
                     self.output_format = config.get("output_format", "pretty")
                     self.language = config.get("language", "en")
+                    self.strict_validate = config.get("strict_validate", False)
+                    self.show_spinner = config.get("show_spinner", True)
             except json.JSONDecodeError:
                 print(f"Error reading {config_file}. Using default configuration.")
             except Exception as e:
@@ -1379,7 +1582,9 @@ class ChatbotConfig:
         config = {
             "verbose": self.verbose,
             "output_format": self.output_format,
-            "language": self.language
+            "language": self.language,
+            "strict_validate": self.strict_validate,
+            "show_spinner": self.show_spinner
         }
         try:
             with open("chatbot_config.json", 'w') as f:
@@ -1389,15 +1594,28 @@ class ChatbotConfig:
             print(f"Error saving configuration: {e}")
 
 class ConversationContext:
+    SUMMARY_ITEM_KEYS = ("id", "name")
+    SUMMARY_MAX_DICT_KEYS = 10
+
     def __init__(self, max_history=10):
         self.history = deque(maxlen=max_history)
-        self.current_context = None
+        self.current_context = None # Full output of the last command, used to resolve follow-ups
+
+    @classmethod
+    def _summarize(cls, output):
+        """Shrinks a command output to the parts the history view needs."""
+        if isinstance(output, list):
+            return [{k: item[k] for k in cls.SUMMARY_ITEM_KEYS if k in item} if isinstance(item, dict) else item
+                    for item in output]
+        if isinstance(output, dict):
+            return dict(islice(output.items(), cls.SUMMARY_MAX_DICT_KEYS))
+        return output
 
     def add_to_history(self, command, output):
-        self.history.append({"command": command, "output": output, "timestamp": datetime.now().isoformat()})
+        self.history.append({"command": command, "output": self._summarize(output), "timestamp": datetime.now().isoformat()})
 
     def get_history(self):
-        return list(self.history)
+        return self.history # deque is iterable and sized; no need to copy it
 
     def set_current_context(self, context):
         self.current_context = context
@@ -1407,8 +1625,51 @@ class ConversationContext:
 
 # Setup logging (from runner.py)
 # Ensure the log file is created where the script is run, or specify an absolute path.
-logging.basicConfig(filename="consolidated_chatbot.log", level=logging.INFO, 
-                    format="%(asctime)s - %(levelname)s - %(message)s")
+# Logging calls only enqueue the record; a background listener formats and writes it to the log file.
+_log_file_handler = logging.FileHandler("consolidated_chatbot.log")
+_log_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_queue = queue.SimpleQueue()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _start_log_listener():
+    """Starts the thread draining the log queue (again in each forked worker, where threads don't survive)."""
+    global _log_listener
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler, respect_handler_level=True)
+    _log_listener.start()
+
+def _stop_log_listener():
+    if _log_listener is not None:
+        _log_listener.stop() # Writes out any records still queued
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock prepare() formats the record (so every %s argument, _LazyJson included) on the
+    logging thread. Records with a traceback are still prepared here, since exc_info pins frames.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+_start_log_listener()
+atexit.register(_stop_log_listener)
+_log_queue_handler = _DeferredQueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s")) # The file handler applies the real format
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
+
+class _LazyJson:
+    """Defers JSON encoding of a log argument until a handler actually formats the record."""
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        if _json_fast is json:
+            return json.dumps(self.obj, default=str)
+        return _json_fast.dumps(self.obj, default=str, option=_JSON_FAST_DUMPS_OPTION).decode()
 
 # Enhanced help with examples and settings (from runner.py)
 def display_help(config):
@@ -1493,6 +1754,15 @@ def parse_follow_up(user_input, current_context_data):
         return match_id.group(2)
     return None
 
+# Listings render at most TABLE_MAX_ROWS rows, followed by a "... (N more)" row
+TABLE_MAX_ROWS = 100
+
+# Bounded repr for history previews; stops descending into large outputs early
+_HISTORY_REPR = reprlib.Repr()
+_HISTORY_REPR.maxlist = 3
+_HISTORY_REPR.maxdict = 3
+_HISTORY_REPR.maxstring = 50
+
 # Format output (from runner.py)
 def format_output(output, config: ChatbotConfig):
     if output is None:
@@ -1528,8 +1798,14 @@ def format_output(output, config: ChatbotConfig):
             keys = list(output[0].keys())
             for key in keys:
                 table.add_column(key.replace('_', ' ').capitalize(), style="blue")
-            for item in output:
-                table.add_row(*[str(item.get(k, "")) for k in keys])
+            # Rendering cost grows with every row, so very large listings are truncated
+            shown = output[:TABLE_MAX_ROWS]
+            rows = [tuple(str(item.get(k, "")) for k in keys) for item in shown]
+            for row in rows:
+                table.add_row(*row)
+            hidden = len(output) - len(shown)
+            if hidden:
+                table.add_row(f"... ({hidden} more)", *([""] * (len(keys) - 1)))
             return table
         elif isinstance(output, dict): # Handle single dictionary output prettily
             table = Table(title="Details")
@@ -1540,6 +1816,31 @@ def format_output(output, config: ChatbotConfig):
             return table
         return Pretty(output, expand_all=True) # Fallback for other types
 
+SUGGESTION_DEFAULT = "Try 'help' or rephrase."
+SUGGESTION_NOT_FOUND = "Check ID/name."
+
+def _render_error(error_msg: str, user_input: str, remote: bool = False):
+    """Shows a CLI error panel and logs it; local errors also get a suggestion."""
+    if remote:
+        text, title, log_label = f"Error: {error_msg}", "Remote API Error", "Remote Command"
+    else:
+        suggestion = SUGGESTION_NOT_FOUND if "not found" in error_msg.lower() else SUGGESTION_DEFAULT
+        text, title, log_label = f"Error: {error_msg}\nSuggestion: {suggestion}", "Error", "Command"
+    if RICH_AVAILABLE:
+        console.print(Panel(Text(text, style="red"), title=f"[red]{title}[/red]"))
+    else:
+        Panel(Text(text, style="red"), title=title) # The fallback Panel prints itself
+    logging.error("%s: %s | Error: %s", log_label, user_input, error_msg)
+
+SPINNER_REFRESH_PER_SECOND = 2 # Rich's default of 12.5 redraws/s is mostly wasted terminal output
+
+def _command_status(status_message: str, config: ChatbotConfig):
+    """Returns a Rich status spinner, or prints the message once when there is no terminal to animate."""
+    if config.show_spinner and sys.stdout.isatty():
+        return console.status(status_message, spinner="dots", refresh_per_second=SPINNER_REFRESH_PER_SECOND)
+    console.print(status_message)
+    return contextlib.nullcontext()
+
 # CLI runner (from runner.py)
 def run_cli(remote_url=None):
     welcome_ascii = (
@@ -1564,10 +1865,12 @@ def run_cli(remote_url=None):
     config = ChatbotConfig()
     context = ConversationContext()
     agent = None
-    if not remote_url:
+    if remote_url:
+        import requests # Only remote mode talks HTTP directly
+    else:
         # Uses the consolidated OpenStackAgent
-        agent = OpenStackAgent() 
-        if not agent.openstack_api.connect(): # Initial connection attempt
+        agent = OpenStackAgent(strict_validate=config.strict_validate)
+        if not agent._ensure_openstack_connection(): # Connected once in OpenStackAgent.__init__
             console.print(Panel(Text("Failed to connect to OpenStack on startup. Check credentials and API endpoint.", style="bold red"), title="Connection Error"))
             # Decide if to exit or allow commands that don't need OpenStack
 
@@ -1575,44 +1878,45 @@ def run_cli(remote_url=None):
         try:
             user_input = Prompt.ask("\n[bold purple]➜ Command[/bold purple]", default="help")
             user_input = user_input.strip()
+            lowered = user_input.lower()
 
-            if user_input.lower() in ["exit", "quit"]:
+            if lowered in ["exit", "quit"]:
                 console.print(Panel(Text("Goodbye!", style="yellow"), title="Session Ended", border_style="yellow"))
                 break
 
-            if user_input.lower() == "help":
+            if lowered == "help":
                 display_help(config)
                 continue
 
-            if user_input.lower() == "tutorial":
+            if lowered == "tutorial":
                 if agent: # Tutorial needs a local agent
                     run_tutorial(agent, context, config)
                 else:
                     console.print(Text("Tutorial requires a local agent. Cannot run in remote mode.", style="yellow"))
                 continue
 
-            if user_input.lower() == "history":
-                history = context.get_history()
-                if not history:
+            if lowered == "history":
+                if not context.history:
                     console.print(Text("No command history yet.", style="italic"))
                     continue
                 table = Table(title="Command History")
                 table.add_column("Timestamp", style="dim cyan")
                 table.add_column("Command", style="bold magenta")
                 table.add_column("Output Preview", style="white")
-                for entry in history:
-                    output_prev = str(entry["output"])[:50] + "..." if len(str(entry["output"])) > 50 else str(entry["output"])
+                for entry in context.history:
+                    output_text = _HISTORY_REPR.repr(entry["output"]) # Never builds the full string
+                    output_prev = output_text[:50] + "..." if len(output_text) > 50 else output_text
                     table.add_row(entry["timestamp"], entry["command"], output_prev)
                 console.print(table)
                 continue
 
-            if user_input.lower().startswith("set verbose"):
-                config.verbose = "on" in user_input.lower()
+            if lowered.startswith("set verbose"):
+                config.verbose = "on" in lowered
                 config.save_config()
                 console.print(Text(f"Verbose mode {'enabled' if config.verbose else 'disabled'}.", style="green"))
                 continue
-            elif user_input.lower().startswith("set output format"):
-                fmt_match = re.search(r"format\s+(pretty|json|raw)", user_input.lower())
+            elif lowered.startswith("set output format"):
+                fmt_match = OUTPUT_FORMAT_PATTERN.search(lowered)
                 if fmt_match:
                     config.output_format = fmt_match.group(1)
                     config.save_config()
@@ -1622,7 +1926,7 @@ def run_cli(remote_url=None):
                 continue
 
             # Handle follow-up queries like 'it', 'that', 'first', etc.
-            if any(ref in user_input.lower().split() for ref in ["it", "that", "first", "second", "last"]):
+            if any(ref in lowered.split() for ref in ["it", "that", "first", "second", "last"]):
                 last_command_output = context.get_current_context()
                 if last_command_output:
                     # The context might be the direct result or a structured dict from agent
@@ -1645,7 +1949,7 @@ def run_cli(remote_url=None):
             
             status_message = f"[yellow]Processing: '{user_input}'[/yellow]"
             if RICH_AVAILABLE:
-                with console.status(status_message, spinner="dots") as status_indicator:
+                with _command_status(status_message, config) as status_indicator:
                     command_output = None
                     if remote_url:
                         try:
@@ -1667,15 +1971,11 @@ def run_cli(remote_url=None):
                             output_display = format_output(command_output, config)
                             console.print(Panel(output_display, title="[green]Remote Success[/green]", border_style="green", 
                                                 subtitle=f"Remote Command: '{user_input}'"))
-                            logging.info(f"Remote Command: {user_input} | Success | Output: {json.dumps(command_output)}")
+                            logging.info("Remote Command: %s | Success | Output: %s", user_input, _LazyJson(command_output))
                         except requests.exceptions.RequestException as e:
-                            error_msg = f"Network error connecting to remote API: {e}"
-                            console.print(Panel(Text(f"Error: {error_msg}", style="red"), title="[red]Remote API Error[/red]"))
-                            logging.error(f"Remote Command: {user_input} | Error: {error_msg}")
+                            _render_error(f"Network error connecting to remote API: {e}", user_input, remote=True)
                         except Exception as e:
-                            error_msg = str(e) or "Unknown error from remote API."
-                            console.print(Panel(Text(f"Error: {error_msg}", style="red"), title="[red]Remote API Error[/red]"))
-                            logging.error(f"Remote Command: {user_input} | Error: {error_msg}")
+                            _render_error(str(e) or "Unknown error from remote API.", user_input, remote=True)
                     elif agent: # Local processing
                         try:
                             if status_indicator: status_indicator.stop() # Stop status for agent's own prints
@@ -1689,12 +1989,9 @@ def run_cli(remote_url=None):
                                                 subtitle=f"Command: '{user_input}'"))
                             if config.verbose and agent.last_execution_time is not None:
                                 console.print(Text(f"Verbose: Processed in {agent.last_execution_time:.2f}s", style="dim cyan"))
-                            logging.info(f"Command: {user_input} | Success | Output: {json.dumps(command_output)}")
+                            logging.info("Command: %s | Success | Output: %s", user_input, _LazyJson(command_output))
                         except Exception as e:
-                            error_msg = str(e) or "Unknown error during local execution."
-                            suggestion = "Try 'help' or rephrase." if "not found" not in error_msg.lower() else "Check ID/name."
-                            console.print(Panel(Text(f"Error: {error_msg}\nSuggestion: {suggestion}", style="red"), title="[red]Error[/red]"))
-                            logging.error(f"Command: {user_input} | Error: {error_msg}")
+                            _render_error(str(e) or "Unknown error during local execution.", user_input)
                     else:
                         console.print(Panel(Text("Agent not available and no remote URL specified.", style="red"), title="Configuration Error"))
             else: # Fallback for no RICH_AVAILABLE
@@ -1715,12 +2012,9 @@ def run_cli(remote_url=None):
                         Panel(output_display, title="Success", subtitle=f"Command: '{user_input}'")
                         if config.verbose and agent.last_execution_time is not None:
                             print(f"Verbose: Processed in {agent.last_execution_time:.2f}s")
-                        logging.info(f"Command: {user_input} | Success | Output: {json.dumps(command_output)}")
+                        logging.info("Command: %s | Success | Output: %s", user_input, _LazyJson(command_output))
                     except Exception as e:
-                        error_msg = str(e) or "Unknown error during local execution."
-                        suggestion = "Try 'help' or rephrase." if "not found" not in error_msg.lower() else "Check ID/name."
-                        Panel(Text(f"Error: {error_msg}\nSuggestion: {suggestion}", style="red"), title="Error")
-                        logging.error(f"Command: {user_input} | Error: {error_msg}")
+                        _render_error(str(e) or "Unknown error during local execution.", user_input)
                 else:
                     Panel(Text("Agent not available and no remote URL specified.", style="red"), title="Configuration Error")
 
@@ -1733,65 +2027,248 @@ def run_cli(remote_url=None):
             break # Exit on fatal errors in the loop
 
 # Web server runner (from runner.py)
-app = Flask(__name__)
-CORS(app)
-# Global agent for Flask app - initialized when run_web is called.
-# This is a simple approach; for production, consider Flask app factories and better state management.
-global_web_agent: Optional[OpenStackAgent] = None
+def _dumps_bytes(obj) -> bytes:
+    """Serializes obj straight to bytes (orjson) or via the stdlib encoder as a fallback."""
+    if _json_fast is json:
+        return json.dumps(obj, default=str).encode()
+    return _json_fast.dumps(obj, default=str, option=_JSON_FAST_DUMPS_OPTION)
+
+def _json_response(payload, status: int = 200):
+    """Builds a JSON response without going through jsonify's str round-trip."""
+    return _get_app().response_class(_dumps_bytes(payload), status=status, mimetype='application/json')
+
+class _ResponseCache:
+    """Thread-safe LRU of serialized responses whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Clients sending 'Accept: application/x-ndjson' get list results longer than this streamed,
+# one JSON object per line, instead of a single {"result": [...]} document
+NDJSON_STREAM_THRESHOLD = 100
+
+def _ndjson_lines(rows):
+    """Yields each row as one newline-terminated JSON line."""
+    for row in rows:
+        yield _dumps_bytes(row) + b"\n"
+
+# Successful read-only /command responses, keyed by (command, agent state version).
+# state_version only moves inside this process: under a multi-worker server a write handled by
+# another worker does not invalidate this cache, so reads may lag it by up to RESPONSE_CACHE_TTL
+# seconds. Lower it (0 disables caching) when workers must see each other's writes at once.
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 5))
+_response_cache = _ResponseCache(maxsize=1024, ttl=RESPONSE_CACHE_TTL)
+
+# Flask is only imported when web mode (or a WSGI server importing `app`) needs it, keeping CLI start-up lean
+_web_app = None
+
+def _create_app():
+    """Builds the Flask app serving /command."""
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    from flask_cors import CORS
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider that serializes with orjson when it is installed."""
+
+        def dumps(self, obj, **kwargs):
+            if _json_fast is json:
+                return super().dumps(obj, **kwargs)
+            return _json_fast.dumps(obj, default=str, option=_JSON_FAST_DUMPS_OPTION).decode()
+
+        def loads(self, s, **kwargs):
+            return _json_fast.loads(s)
+
+    flask_app = Flask(__name__)
+    flask_app.json = ORJSONProvider(flask_app)
+    CORS(flask_app)
+    try:
+        from flask_compress import Compress
+        flask_app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        flask_app.config.setdefault('COMPRESS_LEVEL', 5)
+        Compress(flask_app)
+    except ImportError:
+        pass  # responses go out uncompressed without flask-compress
+    flask_app.add_url_rule('/command', view_func=handle_command, methods=['POST'])
+    return flask_app
+
+def _get_app():
+    """Returns the module's Flask app, creating it on first use."""
+    global _web_app
+    if _web_app is None:
+        _web_app = _create_app()
+    return _web_app
+
+def __getattr__(name):
+    # Keeps `gunicorn consolidated_chatbot:app` working now that the app is built lazily
+    if name == 'app':
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Pool of agents for the Flask app - created lazily in each server process, one agent per request thread
+# so concurrent requests never share an agent. WSGI workers fork from the master, so every worker
+# must build its own agents and OpenStack connections.
+web_agent_pool: Optional["queue.Queue[OpenStackAgent]"] = None
+_web_agent_lock = threading.Lock()
+
+WEB_HOST = '0.0.0.0'
+WEB_PORT = 5001
+WEB_THREADS = 4
+
+def _init_web_agent_pool(size: int = WEB_THREADS) -> "queue.Queue[OpenStackAgent]":
+    """Returns this process's agent pool, creating and connecting the agents on first use."""
+    global web_agent_pool
+    with _web_agent_lock:
+        if web_agent_pool is None:
+            console.print(Panel(Text(f"Initializing {size} OpenStack Agents for Web Server...", style="bold blue"), title="Web Server Mode"))
+            pool = queue.Queue()
+            connected = 0
+            for _ in range(size):
+                agent = OpenStackAgent()
+                connected += agent._ensure_openstack_connection()
+                pool.put(agent)
+            if not connected:
+                console.print(Panel(Text("CRITICAL: Failed to connect to OpenStack for web server. API will likely fail.", style="bold red"), title="Connection Error"))
+            else:
+                console.print(Text(f"OpenStack Agents initialized for Web Server ({connected}/{size} connected).", style="green"))
+            web_agent_pool = pool
+    return web_agent_pool
+
+# Non-success agent statuses returned to the client as-is: status -> (HTTP code, log level, log label).
+# Anything else that isn't 'success' is reported as an agent error.
+_STATUS_DISPATCH = {
+    'missing_parameters': (400, logging.WARNING, "Missing Parameters"),
+    'clarification_needed': (400, logging.INFO, "Clarification Needed"),
+}
 
-@app.route('/command', methods=['POST'])
 def handle_command():
-    global global_web_agent
-    if not global_web_agent:
-        # This should ideally not happen if run_web initializes it properly.
-        logging.error("Web agent not initialized before request.")
-        return jsonify({'error': 'Web agent not initialized. Server error.'}), 500
-
-    data = request.get_json()
-    if not data or 'command' not in data:
-        return jsonify({'error': 'Missing command in request body'}), 400
+    from flask import request
+    if web_agent_pool is None:
+        try:
+            _init_web_agent_pool()
+        except Exception as e:
+            logging.error("Web agent could not be initialized: %s", e)
+            return _json_response({'error': 'Web agent not initialized. Server error.'}, 500)
+
+    try:
+        data = _json_fast.loads(request.get_data(cache=False))
+    except ValueError: # JSONDecodeError, or undecodable bytes with the stdlib parser
+        return _json_response({'error': 'Invalid JSON in request body'}, 400)
+    if not isinstance(data, dict) or 'command' not in data:
+        return _json_response({'error': 'Missing command in request body'}, 400)
     
     user_command = data['command']
     logging.info(f"API Command Received: {user_command}")
+    cache_key = (user_command, OpenStackAgent.state_version)
+    cached_body = _response_cache.get(cache_key)
+    if cached_body is not None:
+        logging.info(f"API Command: {user_command} | Served from cache")
+        return _get_app().response_class(cached_body, status=200, mimetype='application/json')
     
     try:
         # The agent's execute_command is now designed to return a dict for web
-        command_output_structured = global_web_agent.execute_command(user_command, is_web=True)
+        agent = web_agent_pool.get() # Blocks while every agent is busy
+        try:
+            command_output_structured = agent.execute_command(user_command, is_web=True)
+        finally:
+            web_agent_pool.put(agent)
         
         if isinstance(command_output_structured, dict) and 'status' in command_output_structured:
-            if command_output_structured['status'] == 'success':
-                logging.info(f"API Command: {user_command} | Success | Result: {json.dumps(command_output_structured.get('result'))}")
-                return jsonify({'result': command_output_structured.get('result')}), 200
-            elif command_output_structured['status'] == 'missing_parameters':
-                logging.warning(f"API Command: {user_command} | Missing Parameters | Details: {json.dumps(command_output_structured)}")
-                return jsonify(command_output_structured), 400 # Bad Request
-            elif command_output_structured['status'] == 'clarification_needed':
-                logging.info(f"API Command: {user_command} | Clarification Needed | Message: {command_output_structured.get('message')}")
-                return jsonify(command_output_structured), 400 # Bad Request
+            status = command_output_structured['status']
+            if status == 'success':
+                result = command_output_structured.get('result')
+                logging.info("API Command: %s | Success | Result: %s", user_command, _LazyJson(result))
+                if (isinstance(result, list) and len(result) > NDJSON_STREAM_THRESHOLD
+                        and 'application/x-ndjson' in request.headers.get('Accept', '')):
+                    return _get_app().response_class(_ndjson_lines(result), status=200, mimetype='application/x-ndjson')
+                body = _dumps_bytes({'result': result})
+                if command_output_structured.get('function_name') in READ_ONLY_FUNCTIONS:
+                    _response_cache.put(cache_key, body)
+                return _get_app().response_class(body, status=200, mimetype='application/json')
+            dispatch = _STATUS_DISPATCH.get(status)
+            if dispatch:
+                code, level, label = dispatch
+                logging.log(level, "API Command: %s | %s | Details: %s", user_command, label, _LazyJson(command_output_structured))
+                return _json_response(command_output_structured, code)
             else: # Includes 'error' status or other unknown statuses
                 error_msg = command_output_structured.get('message', 'An unknown error occurred in the agent.')
                 logging.error(f"API Command: {user_command} | Agent Error | Message: {error_msg}")
-                return jsonify({'error': error_msg}), 500 # Internal Server Error
+                return _json_response({'error': error_msg}, 500) # Internal Server Error
         else:
             # This case should ideally be handled by the agent returning a structured error
             error_msg = "Unexpected response format from agent during web command execution."
             logging.error(f"API Command: {user_command} | Unexpected Agent Response: {command_output_structured}")
-            return jsonify({'error': error_msg}), 500
+            return _json_response({'error': error_msg}, 500)
 
     except Exception as e:
         error_msg = str(e) or "Unknown error processing command in web handler."
         logging.critical(f"API Command: {user_command} | Unhandled Exception in /command: {error_msg}", exc_info=True)
-        return jsonify({'error': error_msg}), 500
-
-def run_web():
-    global global_web_agent
-    console.print(Panel(Text("Initializing OpenStack Agent for Web Server...", style="bold blue"), title="Web Server Mode"))
-    global_web_agent = OpenStackAgent()
-    if not global_web_agent.openstack_api.connect():
-        console.print(Panel(Text("CRITICAL: Failed to connect to OpenStack for web server. API will likely fail.", style="bold red"), title="Connection Error"))
-    else:
-        console.print(Text("OpenStack Agent initialized and connected for Web Server.", style="green"))
+        return _json_response({'error': error_msg}, 500)
 
+def _serve_with_gunicorn(workers: int) -> bool:
+    """Runs app under gunicorn with threaded workers; returns False if gunicorn isn't installed."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+
+    class _GunicornApp(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        'bind': f"{WEB_HOST}:{WEB_PORT}",
+        'workers': workers,
+        'threads': WEB_THREADS,
+        'worker_class': 'gthread',
+        'post_fork': lambda server, worker: _start_log_listener(),
+        'post_worker_init': lambda worker: _init_web_agent_pool(WEB_THREADS), # One agent per worker thread
+    }
+    _GunicornApp(_get_app(), options).run()
+    return True
+
+def _serve_with_waitress() -> bool:
+    """Runs app under waitress (Windows has no fork); returns False if waitress isn't installed."""
+    try:
+        from waitress import serve
+    except ImportError:
+        return False
+    _init_web_agent_pool(WEB_THREADS * 2)
+    serve(_get_app(), host=WEB_HOST, port=WEB_PORT, threads=WEB_THREADS * 2)
+    return True
+
+def run_web(workers: Optional[int] = None):
+    workers = workers or (os.cpu_count() or 1) * 2 + 1
     console.print(Panel(Text("Starting Flask web server for OpenStack AI Agent...", style="bold blue"), title="Web Server Mode", border_style="blue"))
     console.print(Text("API Endpoint available at ", style="green"), Text("/command", style="bold green"), Text(" (POST)", style="green"))
     console.print(Text("Example usage with curl:", style="yellow"))
@@ -1802,7 +2279,15 @@ def run_web():
     log = logging.getLogger('werkzeug')
     log.setLevel(logging.WARNING) # Or ERROR, to reduce verbosity from HTTP requests
 
-    app.run(host='0.0.0.0', port=5001, debug=False) # debug=False for production/demonstration
+    # Prefer a production WSGI server; the Werkzeug dev server handles one request at a time
+    if sys.platform == 'win32':
+        if _serve_with_waitress():
+            return
+    elif _serve_with_gunicorn(workers):
+        return
+    console.print(Text("gunicorn/waitress not installed; falling back to the Flask development server.", style="yellow"))
+    _init_web_agent_pool()
+    _get_app().run(host=WEB_HOST, port=WEB_PORT, debug=False) # debug=False for production/demonstration
 
 # Main function (from runner.py)
 def main():
@@ -1811,6 +2296,8 @@ def main():
                         help="Run in CLI or web mode. Default: cli.")
     parser.add_argument("--remote-url", type=str, default=None, 
                         help="URL of a remote OpenStack AI Agent API for the CLI to connect to (e.g., http://your-server:5001). This makes the CLI a client.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of gunicorn worker processes in web mode. Default: 2 * CPU count + 1.")
     # Add argument for GOOGLE_API_KEY if not set in environment
     parser.add_argument("--google-api-key", type=str, default=os.environ.get("GOOGLE_API_KEY"),
                         help="Google API Key for Gemini. Overrides GOOGLE_API_KEY environment variable if provided.")
@@ -1821,13 +2308,9 @@ def main():
     global GOOGLE_API_KEY
     if args.google_api_key:
         GOOGLE_API_KEY = args.google_api_key
-        # Re-configure genai if the key was updated and is valid
+        # genai is configured lazily by _get_genai() with whichever key is current on first use
         if GOOGLE_API_KEY:
-            try:
-                genai.configure(api_key=GOOGLE_API_KEY)
-                print(f"Google AI configured with API key from CLI argument.")
-            except Exception as e:
-                print(f"Error re-configuring Google AI with provided key: {e}")
+            print(f"Google AI will use the API key from CLI argument.")
         else:
             print("No Google API Key provided via CLI or environment. AI features will be limited.")
     elif not GOOGLE_API_KEY:
@@ -1836,11 +2319,7 @@ def main():
         key_input = Prompt.ask("Please enter your Google API Key (or press Enter to skip AI features):").strip()
         if key_input:
             GOOGLE_API_KEY = key_input
-            try:
-                genai.configure(api_key=GOOGLE_API_KEY)
-                print("Google AI configured with API key provided at runtime.")
-            except Exception as e:
-                print(f"Error configuring Google AI with provided key: {e}")
+            print("Google AI will use the API key provided at runtime.")
         else:
             print("AI features will be limited as no Google API Key was provided.")
 
@@ -1852,7 +2331,7 @@ def main():
         run_cli()
     elif args.mode == "web":
         print("Web Server Mode: Starting local agent API.")
-        run_web()
+        run_web(workers=args.workers)
     else:
         # This case should not be reached due to argparse choices
         print("Invalid mode or arguments. Use --help for options.")
@@ -8,30 +8,125 @@ For development and showcasing purposes.
 """
 
 import json
-import uuid
+import logging
+import mmap
+import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple, Dict, Any, List
 from datetime import datetime
 from mongo_db import MongoDB
 
+logger = logging.getLogger(__name__)
+
+# Random bytes are read from the OS in 4 KB blocks and sliced into 16-byte UUIDs
+_URANDOM_BLOCK = 4096
+_urandom_buf = b''
+_urandom_pos = 0
+_urandom_lock = threading.Lock()
+
+def _new_uuid() -> str:
+    """Return a random (version 4) UUID string, drawing from a buffered os.urandom block."""
+    global _urandom_buf, _urandom_pos
+    with _urandom_lock:
+        if _urandom_pos + 16 > len(_urandom_buf):
+            _urandom_buf = os.urandom(_URANDOM_BLOCK)
+            _urandom_pos = 0
+        raw = bytearray(_urandom_buf[_urandom_pos:_urandom_pos + 16])
+        _urandom_pos += 16
+    # Set the version and variant bits and format the hex directly, skipping the uuid.UUID object.
+    # IDs keep OpenStack's dashed form since callers and the seed data compare against it.
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def _reset_urandom_buffer():
+    """Drop the inherited buffer after fork so parent and child never hand out the same UUIDs."""
+    global _urandom_buf, _urandom_pos
+    _urandom_buf, _urandom_pos = b'', 0
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_urandom_buffer)
+
+# Prefer orjson for parsing JSON when available
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = json
+
+# Parsed seed files keyed by path, reused across FakeOpenStackAPI instances while the file's mtime is unchanged
+_JSON_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+def _parse_json_file(path: str) -> Any:
+    """Parse a JSON file, letting orjson read it through a memory map instead of copying it first."""
+    with open(path, 'rb') as f:
+        if _json_fast is not json:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return _json_fast.loads(view)
+            except (ValueError, OSError):
+                # Empty files can't be mapped and some platforms refuse; parse invalid JSON the usual way too
+                f.seek(0)
+        return _json_fast.loads(f.read())
+
+def _cached_json_load(path: str) -> Any:
+    """Load a JSON seed file, parsing it again only when it has changed on disk."""
+    mtime = os.path.getmtime(path)
+    cached = _JSON_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _JSON_CACHE[path] = (mtime, _parse_json_file(path))
+    # Callers only hand the result to MongoDB.insert_many/set_singleton, which copy before writing
+    return cached[1]
+
+# Fake server IPs are 192.168.<third>.<fourth>: a running sequence number fills the third octet
+# (1-254) and carries into the fourth (100-254), wrapping only after every one of those is used
+_IP_THIRD_OCTETS = 254
+_IP_FOURTH_BASE = 100
+_IP_FOURTH_OCTETS = 255 - _IP_FOURTH_BASE
+
+def _server_ip(sequence: int) -> str:
+    """Fake server IP for a (1-based) IP sequence number."""
+    n = sequence - 1
+    third = n % _IP_THIRD_OCTETS + 1
+    fourth = _IP_FOURTH_BASE + (n // _IP_THIRD_OCTETS) % _IP_FOURTH_OCTETS
+    return f"192.168.{third}.{fourth}"
+
+def _ip_sequence(ip: str) -> Optional[int]:
+    """Inverse of _server_ip, or None for an address it could not have produced."""
+    try:
+        third, fourth = (int(octet) for octet in ip.split('.')[2:4])
+    except ValueError:
+        return None
+    if not (1 <= third <= _IP_THIRD_OCTETS and _IP_FOURTH_BASE <= fourth < _IP_FOURTH_BASE + _IP_FOURTH_OCTETS):
+        return None
+    return (fourth - _IP_FOURTH_BASE) * _IP_THIRD_OCTETS + third
+
 class FakeOpenStackAPI:
     """Fake API class mimicking OpenStack operations using MongoDB."""
     
+    # Collections mirrored in memory with id/name indexes for O(1) lookups
+    INDEXED_COLLECTIONS = ('servers', 'images', 'flavors', 'networks', 'volumes')
+    COLLECTIONS = INDEXED_COLLECTIONS + ('usage',)
+    
     def __init__(self):
         """Initialize by connecting to MongoDB and loading data."""
         self.conn = None
         self.db = MongoDB()
+        # The web app runs agent commands on a thread pool; every read-modify-write of the in-memory
+        # lists and their indexes happens under this lock (reentrant: lookups nest inside mutations)
+        self._lock = threading.RLock()
         self._ensure_collections()
         self._load_data()
     
     def _ensure_collections(self):
         """Ensure all required collections exist in MongoDB."""
-        # List of collections we need
-        collections = ['servers', 'images', 'flavors', 'networks', 'volumes', 'usage']
-        
-        # Check if collections exist and have data
-        for collection in collections:
-            if not self.db.find_all(collection):
+        # Check if collections have data from metadata counts; the round trips overlap across threads
+        with ThreadPoolExecutor(max_workers=len(self.COLLECTIONS)) as pool:
+            counts = dict(zip(self.COLLECTIONS, pool.map(self.db.count, self.COLLECTIONS)))
+        for collection in self.COLLECTIONS:
+            if counts[collection] == 0:
                 # If collection is empty, try to load from JSON file
                 self._load_collection_from_json(collection)
     
@@ -40,59 +135,152 @@ class FakeOpenStackAPI:
         try:
             json_file = f'fake_data/{collection_name}.json'
             if os.path.exists(json_file):
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                    if data and isinstance(data, list):
-                        self.db.insert_many(collection_name, data)
-                        print(f"Loaded {len(data)} items from {json_file} into MongoDB")
+                data = _cached_json_load(json_file)
+                if data and isinstance(data, list):
+                    self.db.insert_many(collection_name, data)
+                    logger.debug("Loaded %s items from %s into MongoDB", len(data), json_file)
+                elif data and isinstance(data, dict):
+                    self.db.set_singleton(collection_name, data)
+                    logger.debug("Loaded document from %s into MongoDB", json_file)
         except Exception as e:
-            print(f"Error loading {collection_name} from JSON: {e}")
+            logger.error("Error loading %s from JSON: %s", collection_name, e)
     
     def _load_data(self):
         """Load fake data from MongoDB into memory for quick access."""
         try:
-            self.servers = self.db.find_all('servers')
-            self.images = self.db.find_all('images')
-            self.flavors = self.db.find_all('flavors')
-            self.networks = self.db.find_all('networks')
-            self.volumes = self.db.find_all('volumes')
-            self.usage = self.db.find_all('usage')
-            if not self.usage:
-                self.usage = {'project_usage': {}, 'servers_usage': []}
-            else:
-                # If usage is a list with one item, extract that item
-                if isinstance(self.usage, list) and len(self.usage) == 1:
-                    self.usage = self.usage[0]
-                # If usage is still a list but empty, initialize it
-                elif isinstance(self.usage, list) and len(self.usage) == 0:
-                    self.usage = {'project_usage': {}, 'servers_usage': []}
-            print("Fake data loaded successfully from MongoDB!")
+            # pymongo is thread-safe, so the six round trips run concurrently
+            with ThreadPoolExecutor(max_workers=len(self.COLLECTIONS)) as pool:
+                futures = {name: pool.submit(self.db.find_all, name) for name in self.INDEXED_COLLECTIONS}
+                futures['usage'] = pool.submit(self.db.get_singleton, 'usage')
+            self.servers = futures['servers'].result()
+            self.images = futures['images'].result()
+            self.flavors = futures['flavors'].result()
+            self.networks = futures['networks'].result()
+            self.volumes = futures['volumes'].result()
+            self.usage = futures['usage'].result() or {'project_usage': {}, 'servers_usage': []}
+            logger.debug("Fake data loaded successfully from MongoDB!")
         except Exception as e:
-            print(f"Error loading fake data from MongoDB: {e}")
+            logger.error("Error loading fake data from MongoDB: %s", e)
             self.servers = []
             self.images = []
             self.flavors = []
             self.networks = []
             self.volumes = []
             self.usage = {'project_usage': {}, 'servers_usage': []}
+        self._by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._by_name: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._positions: Dict[str, Dict[int, int]] = {}  # id(doc) -> index in the in-memory list
+        for collection_name in self.INDEXED_COLLECTIONS:
+            self._reindex(collection_name)
+        self._reindex_usage()
+        self._next_ip_sequence = self._max_ip_sequence() + 1
+        try:
+            # Other processes share the MongoDB counter; make sure it starts above every IP already assigned
+            self.db.seed_sequence('server_ip', self._next_ip_sequence - 1)
+        except Exception as e:
+            logger.warning("Could not seed the server IP counter in MongoDB: %s", e)
     
-    def _save_data_to_mongodb(self, data, collection_name: str):
-        """Helper function to save data to MongoDB collection."""
+    def _next_server_ip(self) -> str:
+        """Next fake server IP, numbered by the MongoDB counter or the local one as a fallback."""
         try:
-            # Clear existing collection data
-            self.db.delete_many(collection_name, {})
-            
-            # Insert new data
-            if isinstance(data, list):
-                if data:
-                    self.db.insert_many(collection_name, data)
-            else:
-                # For usage which might be a dictionary
-                self.db.insert_one(collection_name, data)
-                
-            print(f"Data successfully saved to MongoDB collection: {collection_name}")
+            sequence = self.db.next_sequence('server_ip')
         except Exception as e:
-            print(f"Error saving data to MongoDB collection {collection_name}: {e}")
+            logger.warning("Could not increment the server IP counter in MongoDB: %s", e)
+            sequence = None
+        with self._lock:
+            if sequence is None:
+                sequence = self._next_ip_sequence
+            self._next_ip_sequence = max(self._next_ip_sequence, sequence) + 1  # Never reuse an address, even after deletions
+        return _server_ip(sequence)
+    
+    def _max_ip_sequence(self) -> int:
+        """Highest IP sequence number among the fake server IPs currently assigned."""
+        highest = 0
+        for srv in self.servers:
+            for ips in srv.get('networks', {}).values():
+                for ip in ips:
+                    highest = max(highest, _ip_sequence(ip) or 0)
+        return highest
+    
+    def _reindex_usage(self):
+        """Rebuild the id and name indexes over servers_usage."""
+        if isinstance(self.usage, list):
+            self.usage = self.usage[0] if self.usage else {'project_usage': {}, 'servers_usage': []}
+        self._usage_by_id, self._usage_by_name = {}, {}
+        for srv in self.usage.get('servers_usage', []):
+            if 'id' in srv:
+                self._usage_by_id.setdefault(srv['id'], srv)
+            if 'name' in srv:
+                self._usage_by_name.setdefault(srv['name'], srv)
+    
+    def _reindex(self, collection_name: str):
+        """Rebuild the id, name and position indexes for an in-memory collection."""
+        by_id, by_name, positions = {}, {}, {}
+        for position, doc in enumerate(getattr(self, collection_name)):
+            by_id.setdefault(doc.get('id'), doc)
+            by_name.setdefault(doc.get('name'), []).append(doc)  # First entry wins, like the old linear scans
+            positions[id(doc)] = position
+        self._by_id[collection_name] = by_id
+        self._by_name[collection_name] = by_name
+        self._positions[collection_name] = positions
+    
+    def _refresh(self, collection_name: str) -> List[Dict[str, Any]]:
+        """Reload a collection from MongoDB into memory and reindex it; returns a snapshot copy."""
+        docs = self.db.find_all(collection_name)
+        with self._lock:
+            setattr(self, collection_name, docs)
+            self._reindex(collection_name)
+            # Callers serialize the result outside the lock, so hand out a copy other threads won't reorder
+            return list(docs)
+    
+    def _lookup(self, collection_name: str, key: str, by_id: bool = True) -> Optional[Dict[str, Any]]:
+        """Find a document by id (optionally) or name, falling back to a MongoDB point query on a miss."""
+        with self._lock:
+            named = self._by_name[collection_name].get(key)
+            doc = (by_id and self._by_id[collection_name].get(key)) or (named[0] if named else None)
+            if doc:
+                return doc
+            # Another process may have written to MongoDB since this instance loaded; fetch only that document
+            if by_id:
+                doc = self.db.find_one_by_id_or_name(collection_name, key)
+            else:
+                doc = self.db.find_one(collection_name, {'name': key})
+            if doc:
+                self._index_add(collection_name, doc)
+            return doc
+    
+    def _index_add(self, collection_name: str, doc: Dict[str, Any]):
+        """Append a new document to an in-memory collection and its indexes."""
+        with self._lock:
+            docs = getattr(self, collection_name)
+            self._positions[collection_name][id(doc)] = len(docs)
+            docs.append(doc)
+            self._by_id[collection_name].setdefault(doc.get('id'), doc)
+            self._by_name[collection_name].setdefault(doc.get('name'), []).append(doc)
+    
+    def _index_remove(self, collection_name: str, doc: Dict[str, Any]):
+        """Remove a document from an in-memory collection and its indexes in O(1).
+
+        The last document is moved into the freed slot, so list order is not preserved.
+        A document that is no longer indexed (removed or refreshed away by another thread) is ignored.
+        """
+        with self._lock:
+            docs = getattr(self, collection_name)
+            positions = self._positions[collection_name]
+            position = positions.pop(id(doc), None)
+            if position is None:
+                return
+            last = docs.pop()
+            if last is not doc:
+                docs[position] = last
+                positions[id(last)] = position
+            if self._by_id[collection_name].get(doc.get('id')) is doc:
+                del self._by_id[collection_name][doc.get('id')]
+            named = self._by_name[collection_name].get(doc.get('name'), [])
+            if doc in named:
+                named.remove(doc)  # Only documents sharing this name
+            if not named:
+                self._by_name[collection_name].pop(doc.get('name'), None)
     
     def is_connected(self) -> bool:
         """Check if connected to MongoDB."""
@@ -100,7 +288,7 @@ class FakeOpenStackAPI:
     
     def connect(self) -> bool:
         """Simulate a successful connection."""
-        print("Simulating connection to Fake OpenStack via MongoDB...")
+        logger.debug("Simulating connection to Fake OpenStack via MongoDB...")
         return self.db.connect()
     
     def _ensure_connection(self) -> bool:
@@ -109,43 +297,43 @@ class FakeOpenStackAPI:
     
     def list_servers(self) -> List[Dict[str, Any]]:
         """List all fake servers from MongoDB."""
-        print("Listing fake servers from MongoDB...")
-        self.servers = self.db.find_all('servers')
-        if not self.servers:
-            print("No servers found.")
-        return self.servers
+        logger.debug("Listing fake servers from MongoDB...")
+        servers = self._refresh('servers')
+        if not servers:
+            logger.debug("No servers found.")
+        return servers
     
     def list_images(self) -> List[Dict[str, Any]]:
         """List available fake images from MongoDB."""
-        print("Listing fake images from MongoDB...")
-        self.images = self.db.find_all('images')
-        if not self.images:
-            print("No images found.")
-        return self.images
+        logger.debug("Listing fake images from MongoDB...")
+        images = self._refresh('images')
+        if not images:
+            logger.debug("No images found.")
+        return images
     
     def list_flavors(self) -> List[Dict[str, Any]]:
         """List available fake flavors from MongoDB."""
-        print("Listing fake flavors from MongoDB...")
-        self.flavors = self.db.find_all('flavors')
-        if not self.flavors:
-            print("No flavors found.")
-        return self.flavors
+        logger.debug("Listing fake flavors from MongoDB...")
+        flavors = self._refresh('flavors')
+        if not flavors:
+            logger.debug("No flavors found.")
+        return flavors
     
     def list_networks(self) -> List[Dict[str, Any]]:
         """List available fake networks from MongoDB."""
-        print("Listing fake networks from MongoDB...")
-        self.networks = self.db.find_all('networks')
-        if not self.networks:
-            print("No networks found.")
-        return self.networks
+        logger.debug("Listing fake networks from MongoDB...")
+        networks = self._refresh('networks')
+        if not networks:
+            logger.debug("No networks found.")
+        return networks
     
     def list_volumes(self) -> List[Dict[str, Any]]:
         """List available fake volumes from MongoDB."""
-        print("Listing fake volumes from MongoDB...")
-        self.volumes = self.db.find_all('volumes')
-        if not self.volumes:
-            print("No volumes found.")
-        return self.volumes
+        logger.debug("Listing fake volumes from MongoDB...")
+        volumes = self._refresh('volumes')
+        if not volumes:
+            logger.debug("No volumes found.")
+        return volumes
     
     def create_server(self, 
                      name: str, 
@@ -154,47 +342,39 @@ class FakeOpenStackAPI:
                      network_name: str = 'default', 
                      volume_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Create a new fake server in MongoDB."""
-        print(f"Attempting to create fake server '{name}'...")
+        logger.debug("Attempting to create fake server '%s'...", name)
         
-        # Refresh data from MongoDB
-        self.images = self.db.find_all('images')
-        self.flavors = self.db.find_all('flavors')
-        self.networks = self.db.find_all('networks')
-        
-        image = next((img for img in self.images if img['name'] == image_name), None)
-        flavor = next((flv for flv in self.flavors if flv['name'] == flavor_name), None)
-        network = next((net for net in self.networks if net['name'] == network_name), None)
+        image = self._lookup('images', image_name, by_id=False)
+        flavor = self._lookup('flavors', flavor_name, by_id=False)
+        network = self._lookup('networks', network_name, by_id=False)
         
         if not image:
-            print(f"Error: Image '{image_name}' not found.")
+            logger.error("Image '%s' not found.", image_name)
             return None
         if not flavor:
-            print(f"Error: Flavor '{flavor_name}' not found.")
+            logger.error("Flavor '%s' not found.", flavor_name)
             return None
         if not network:
-            print(f"Error: Network '{network_name}' not found.")
+            logger.error("Network '%s' not found.", network_name)
             return None
         
-        # Get current servers to determine IP address
-        self.servers = self.db.find_all('servers')
-        
         new_server = {
-            'id': str(uuid.uuid4()),
+            'id': _new_uuid(),
             'name': name,
             'status': 'ACTIVE',  # Immediately active for simplicity
             'created': datetime.now().isoformat(),
             'flavor': {'id': flavor['id']},
             'image': {'id': image['id']},
-            'networks': {network['name']: [f"192.168.{len(self.servers) + 1}.100"]}
+            'networks': {network['name']: [self._next_server_ip()]}
         }
         
         # Add server to MongoDB
         self.db.insert_one('servers', new_server)
-        self.servers.append(new_server)
+        self._index_add('servers', new_server)
         
         if volume_size:
             new_volume = {
-                'id': str(uuid.uuid4()),
+                'id': _new_uuid(),
                 'name': f"{name}-boot-volume",
                 'status': 'in-use',
                 'size': volume_size,
@@ -202,10 +382,10 @@ class FakeOpenStackAPI:
             }
             # Add volume to MongoDB
             self.db.insert_one('volumes', new_volume)
-            self.volumes.append(new_volume)
-            print(f"  Created fake boot volume '{new_volume['name']}' of size {volume_size} GB.")
+            self._index_add('volumes', new_volume)
+            logger.debug("Created fake boot volume '%s' of size %s GB.", new_volume['name'], volume_size)
         
-        print(f"Fake server '{name}' created with ID: {new_server['id']}")
+        logger.debug("Fake server '%s' created with ID: %s", name, new_server['id'])
         return {
             'id': new_server['id'],
             'name': new_server['name'],
@@ -218,63 +398,58 @@ class FakeOpenStackAPI:
     
     def delete_server(self, server_id_or_name: str) -> bool:
         """Delete a fake server from MongoDB."""
-        # Refresh servers from MongoDB
-        self.servers = self.db.find_all('servers')
-        
-        server = next((srv for srv in self.servers if srv['id'] == server_id_or_name or srv['name'] == server_id_or_name), None)
+        server = self._lookup('servers', server_id_or_name)
         if not server:
-            print(f"Fake server '{server_id_or_name}' not found. Perhaps already deleted?")
+            logger.warning("Fake server '%s' not found. Perhaps already deleted?", server_id_or_name)
             return True
         
-        print(f"Deleting fake server '{server['name']}' (ID: {server['id']})...")
+        logger.debug("Deleting fake server '%s' (ID: %s)...", server['name'], server['id'])
         
         # Delete server from MongoDB
         self.db.delete_one('servers', {'id': server['id']})
-        self.servers.remove(server)
-        
-        # Refresh volumes from MongoDB
-        self.volumes = self.db.find_all('volumes')
+        self._index_remove('servers', server)
         
-        # Find and delete associated volumes
-        volumes_to_delete = [vol for vol in self.volumes if any(att['server_id'] == server['id'] for att in vol.get('attachments', []))]
-        for volume in volumes_to_delete:
-            self.db.delete_one('volumes', {'id': volume['id']})
-            self.volumes.remove(volume)
+        # Delete associated volumes in one server-side query, then drop them from memory
+        self.db.delete_many('volumes', {'attachments.server_id': server['id']})
+        with self._lock:
+            volumes_to_delete = [vol for vol in self.volumes if any(att['server_id'] == server['id'] for att in vol.get('attachments', []))]
+            for volume in volumes_to_delete:
+                self._index_remove('volumes', volume)
         
-        print(f"Fake server '{server['name']}' deleted successfully.")
+        logger.debug("Fake server '%s' deleted successfully.", server['name'])
         return True
     
     def resize_server(self, server_id_or_name: str, flavor_name: str) -> bool:
         """Resize a fake server to a new flavor in MongoDB."""
-        # Refresh data from MongoDB
-        self.servers = self.db.find_all('servers')
-        self.flavors = self.db.find_all('flavors')
-        
-        server = next((srv for srv in self.servers if srv['id'] == server_id_or_name or srv['name'] == server_id_or_name), None)
-        flavor = next((flv for flv in self.flavors if flv['name'] == flavor_name), None)
+        server = self._lookup('servers', server_id_or_name)
+        flavor = self._lookup('flavors', flavor_name, by_id=False)
         
         if not server:
-            print(f"Fake server '{server_id_or_name}' not found.")
+            logger.warning("Fake server '%s' not found.", server_id_or_name)
             return False
         if not flavor:
-            print(f"Error: Flavor '{flavor_name}' not found.")
+            logger.error("Flavor '%s' not found.", flavor_name)
             return False
         
-        print(f"Resizing fake server '{server['name']}' to flavor '{flavor_name}'...")
+        logger.debug("Resizing fake server '%s' to flavor '%s'...", server['name'], flavor_name)
         
-        # Update server in MongoDB
-        server['flavor'] = {'id': flavor['id']}
-        self.db.update_one('servers', {'id': server['id']}, server)
+        # Update only the flavor field, atomically, and sync the cached copy from the result
+        updated = self.db.find_one_and_update('servers', {'id': server['id']}, {'flavor': {'id': flavor['id']}})
+        if updated is None:
+            logger.warning("Fake server '%s' no longer exists in MongoDB.", server_id_or_name)
+            self._index_remove('servers', server)
+            return False
+        server.update(updated)
         
-        print(f"Fake server '{server['name']}' resized successfully.")
+        logger.debug("Fake server '%s' resized successfully.", server['name'])
         return True
     
     def create_volume(self, name: str, size_gb: int) -> Optional[Dict[str, Any]]:
         """Create a standalone fake volume in MongoDB."""
-        print(f"Creating fake volume '{name}' of size {size_gb} GB...")
+        logger.debug("Creating fake volume '%s' of size %s GB...", name, size_gb)
         
         new_volume = {
-            'id': str(uuid.uuid4()),
+            'id': _new_uuid(),
             'name': name,
             'status': 'available',
             'size': size_gb,
@@ -283,9 +458,9 @@ class FakeOpenStackAPI:
         
         # Add volume to MongoDB
         self.db.insert_one('volumes', new_volume)
-        self.volumes.append(new_volume)
+        self._index_add('volumes', new_volume)
         
-        print(f"Fake volume '{name}' created with ID: {new_volume['id']}")
+        logger.debug("Fake volume '%s' created with ID: %s", name, new_volume['id'])
         return {
             'id': new_volume['id'],
             'name': new_volume['name'],
@@ -295,21 +470,18 @@ class FakeOpenStackAPI:
     
     def delete_volume(self, volume_id_or_name: str) -> bool:
         """Delete a fake volume from MongoDB."""
-        # Refresh volumes from MongoDB
-        self.volumes = self.db.find_all('volumes')
-        
-        volume = next((vol for vol in self.volumes if vol['id'] == volume_id_or_name or vol['name'] == volume_id_or_name), None)
+        volume = self._lookup('volumes', volume_id_or_name)
         if not volume:
-            print(f"Fake volume '{volume_id_or_name}' not found. Perhaps already deleted?")
+            logger.warning("Fake volume '%s' not found. Perhaps already deleted?", volume_id_or_name)
             return True
         
-        print(f"Deleting fake volume '{volume['name']}' (ID: {volume['id']})...")
+        logger.debug("Deleting fake volume '%s' (ID: %s)...", volume['name'], volume['id'])
         
         # Delete volume from MongoDB
         self.db.delete_one('volumes', {'id': volume['id']})
-        self.volumes.remove(volume)
+        self._index_remove('volumes', volume)
         
-        print(f"Fake volume '{volume['name']}' deleted successfully.")
+        logger.debug("Fake volume '%s' deleted successfully.", volume['name'])
         return True
     
     def create_network_with_subnet(self, network_name: str, 
@@ -319,13 +491,13 @@ class FakeOpenStackAPI:
         if not subnet_name:
             subnet_name = f"{network_name}-subnet"
         
-        print(f"Creating fake network '{network_name}' with subnet '{subnet_name}'...")
+        logger.debug("Creating fake network '%s' with subnet '%s'...", network_name, subnet_name)
         
         new_network = {
-            'id': str(uuid.uuid4()),
+            'id': _new_uuid(),
             'name': network_name,
             'status': 'ACTIVE',
-            'subnets': [f"subnet-{uuid.uuid4()}"]
+            'subnets': [f"subnet-{_new_uuid()}"]
         }
         
         new_subnet = {
@@ -337,11 +509,11 @@ class FakeOpenStackAPI:
         
         # Add network to MongoDB
         self.db.insert_one('networks', new_network)
-        self.networks.append(new_network)
+        self._index_add('networks', new_network)
         
         # Note: Subnets could be stored in a separate collection if needed
         
-        print(f"Fake network '{network_name}' and subnet '{subnet_name}' created.")
+        logger.debug("Fake network '%s' and subnet '%s' created.", network_name, subnet_name)
         return (
             {'id': new_network['id'], 'name': new_network['name'], 'status': new_network['status']},
             {'id': new_subnet['id'], 'name': new_subnet['name'], 'cidr': new_subnet['cidr'], 'network_id': new_subnet['network_id']}
@@ -349,13 +521,7 @@ class FakeOpenStackAPI:
     
     def get_usage(self, identifier: Optional[str] = None) -> Dict[str, Any]:
         """Get usage statistics from MongoDB."""
-        # Refresh usage data from MongoDB
-        usage_data = self.db.find_all('usage')
-        if usage_data and isinstance(usage_data, list) and len(usage_data) > 0:
-            self.usage = usage_data[0]
-        else:
-            self.usage = {'project_usage': {}, 'servers_usage': []}
-        
+        # Usage was loaded and indexed in _load_data; server lookups only query MongoDB on a miss
         # If no identifier given, return everything
         if not identifier:
             return {
@@ -368,12 +534,15 @@ class FakeOpenStackAPI:
             return self.usage.get('project_usage', {})
 
         # Otherwise, look for a server match
-        match = next(
-            (srv for srv in self.usage.get('servers_usage', [])
-             if srv.get('id') == identifier or srv.get('name') == identifier),
-            None
-        )
+        match = self._usage_by_id.get(identifier) or self._usage_by_name.get(identifier)
+        if match:
+            return match
+        # Another process may have added it since load; fetch only the matching entry
+        match = self.db.find_singleton_element('usage', 'servers_usage', identifier)
         if match:
+            with self._lock:
+                self.usage.setdefault('servers_usage', []).append(match)
+                self._reindex_usage()
             return match
 
         # Nothing matched
@@ -0,0 +1,20 @@
+"""Gunicorn settings for serving the FastAPI backend (routes.py).
+
+Usage: gunicorn -c gunicorn_conf.py routes:app
+
+Every worker is a separate process that builds its own OpenStackAgent on startup. Pending
+confirmations live in the worker that issued them unless REDIS_URL is set, so without Redis this
+runs a single worker and refuses WEB_WORKERS above 1.
+"""
+
+import os
+
+bind = f"{os.getenv('WEB_HOST', '0.0.0.0')}:{os.getenv('WEB_PORT', '5001')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_WORKERS", str(2 * (os.cpu_count() or 1) + 1) if os.getenv("REDIS_URL") else "1"))
+if workers > 1 and not os.getenv("REDIS_URL"):
+    raise SystemExit(f"WEB_WORKERS={workers} needs REDIS_URL: confirmations would not be shared between workers")
+keepalive = 30
+# Agent commands wait on the LLM and on OpenStack builds; don't kill workers mid-request
+timeout = int(os.getenv("WEB_TIMEOUT", "300"))
+accesslog = None
@@ -7,7 +7,87 @@ This script migrates data from JSON files to MongoDB collections.
 
 import json
 import os
-from mongo_db import MongoDB
+from concurrent.futures import ThreadPoolExecutor
+from mongo_db import INSERT_BATCH_SIZE, MongoDB
+
+# Prefer orjson for parsing JSON when available
+try:
+    import orjson as _json_fast
+except ImportError:
+    _json_fast = json
+
+# ijson streams array files so large exports never sit in memory whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def _is_json_array(file_path):
+    """Check whether a JSON file's top-level value is an array."""
+    with open(file_path, 'rb') as f:
+        return f.read(64).lstrip()[:1] == b'['
+
+def _iter_json_array(file_path):
+    """Yield the documents of a JSON array file one at a time."""
+    with open(file_path, 'rb') as f:
+        # use_float keeps numbers BSON-encodable (ijson yields Decimal by default)
+        yield from ijson.items(f, 'item', use_float=True)
+
+def _migrate_documents(db, collection_name, documents):
+    """Replace a collection's contents with documents batch by batch; returns the document count.
+
+    Batches go to a staging collection that is renamed over the live one at the end, so documents
+    no longer in the file disappear without tracking every id written, and readers never see a
+    half-migrated collection.
+    """
+    staging_name = f"{collection_name}_migration"
+    db.drop_collection(staging_name)  # Left over from an interrupted run
+    # Creating the indexes also creates the collection, so an empty file still renames cleanly
+    db.create_indexes(staging_name, like=collection_name)
+    batch, written = [], 0
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            written += db.bulk_replace(staging_name, batch)
+            batch.clear()
+    if batch:
+        written += db.bulk_replace(staging_name, batch)
+    if not db.rename_collection(staging_name, collection_name):
+        raise RuntimeError(f"could not replace '{collection_name}' with '{staging_name}'")
+    return written
+
+def _migrate_file(db, json_file):
+    """Migrate one JSON file into the collection named after it; returns True on success."""
+    collection_name = os.path.splitext(json_file)[0]  # Remove .json extension
+    file_path = os.path.join('fake_data', json_file)
+    
+    try:
+        if ijson is not None and _is_json_array(file_path):
+            written = _migrate_documents(db, collection_name, _iter_json_array(file_path))
+            print(f"Migrated {written} documents to '{collection_name}' collection")
+            return True
+        
+        # Read JSON data
+        with open(file_path, 'rb') as f:
+            data = _json_fast.loads(f.read())
+        
+        # Replace the collection's documents with the file's
+        if isinstance(data, list):
+            written = _migrate_documents(db, collection_name, data)
+            if data:
+                print(f"Migrated {written} documents to '{collection_name}' collection")
+            else:
+                print(f"No data to migrate from {json_file}")
+        else:
+            # For single documents like usage
+            db.set_singleton(collection_name, data)
+            print(f"Migrated document to '{collection_name}' collection")
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error migrating {json_file}: {e}")
+        return False
 
 def migrate_json_to_mongodb():
     """Migrate all JSON files in fake_data directory to MongoDB."""
@@ -26,37 +106,9 @@ def migrate_json_to_mongodb():
         print("No JSON files found in fake_data directory.")
         return False
     
-    success_count = 0
-    
-    # Process each JSON file
-    for json_file in json_files:
-        collection_name = os.path.splitext(json_file)[0]  # Remove .json extension
-        file_path = os.path.join('fake_data', json_file)
-        
-        try:
-            # Read JSON data
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Clear existing collection data
-            db.delete_many(collection_name, {})
-            
-            # Insert data into MongoDB
-            if isinstance(data, list):
-                if data:
-                    inserted = db.insert_many(collection_name, data)
-                    print(f"Migrated {inserted} documents to '{collection_name}' collection")
-                else:
-                    print(f"No data to migrate from {json_file}")
-            else:
-                # For single documents like usage
-                db.insert_one(collection_name, data)
-                print(f"Migrated document to '{collection_name}' collection")
-            
-            success_count += 1
-            
-        except Exception as e:
-            print(f"Error migrating {json_file}: {e}")
+    # Files map to independent collections, so migrate them concurrently over the shared pool
+    with ThreadPoolExecutor(max_workers=len(json_files)) as pool:
+        success_count = sum(pool.map(lambda json_file: _migrate_file(db, json_file), json_files))
     
     print(f"Migration completed. Successfully migrated {success_count}/{len(json_files)} files.")
     return success_count > 0
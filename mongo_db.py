@@ -6,17 +6,68 @@ This module provides functionality to connect to MongoDB and perform CRUD operat
 for the OpenStack fake data.
 """
 
+import logging
 import os
-from pymongo import MongoClient
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import bson
+from contextlib import contextmanager
+from bson.codec_options import CodecOptions
+from pymongo import ASCENDING, IndexModel, MongoClient, ReplaceOne, ReturnDocument
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # MongoDB connection settings
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 DB_NAME = os.getenv("MONGO_DB_NAME", "openstack_fake_data")
+INSERT_BATCH_SIZE = int(os.getenv("MONGO_INSERT_BATCH", "1000"))
+FIND_ALL_TTL = float(os.getenv("MONGO_CACHE_TTL", "5"))
+MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+
+def _available_compressors() -> str:
+    """Wire compressors to offer, best first: zstd/snappy only when their optional packages import."""
+    compressors = []
+    for name, module in (('zstd', 'zstandard'), ('snappy', 'snappy')):
+        try:
+            __import__(module)
+            compressors.append(name)
+        except ImportError:
+            pass
+    compressors.append('zlib')  # Always available through the standard library
+    return ",".join(compressors)
+
+COMPRESSORS = os.getenv("MONGO_COMPRESSORS") or _available_compressors()
+
+# Plain dicts and naive datetimes: the cheapest decode settings, and what the JSON seed data produces
+CODEC_OPTIONS = CodecOptions(document_class=dict, tz_aware=False)
+
+# One MongoClient (and its connection pool) per process, shared by every MongoDB instance
+_client = None
+_client_lock = threading.Lock()
+# Indexes are created once per process, not on every connect
+_indexes_ensured = False
+
+def _get_client() -> MongoClient:
+    """Return the process-wide MongoClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not bson.has_c():
+                logger.warning("pymongo's C extensions are not installed; BSON decoding will be much slower")
+            _client = MongoClient(MONGO_URI, maxPoolSize=MAX_POOL_SIZE, minPoolSize=MIN_POOL_SIZE,
+                                  compressors=COMPRESSORS, retryWrites=True)
+        return _client
+
+# Collections looked up by `id`/`name`; usage is a single document without either field
+INDEXED_COLLECTIONS = ('servers', 'images', 'flavors', 'networks', 'volumes')
+# Fixed _id for collections that hold exactly one document (usage)
+SINGLETON_ID = 'singleton'
 
 class MongoDB:
     """MongoDB connection and operations class."""
@@ -25,90 +76,259 @@ class MongoDB:
         """Initialize MongoDB connection."""
         self.client = None
         self.db = None
+        self._collections = {}
+        # collection name -> (fetched_at, documents); dropped by every write to that collection
+        self._find_all_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # collection name -> number of finished writes, so a find_all that overlapped a write isn't cached
+        self._generations: Dict[str, int] = {}
+        self._cache_lock = threading.Lock()
         self.connect()
     
     def connect(self) -> bool:
-        """Connect to MongoDB database."""
+        """Connect to MongoDB database; a no-op once connected."""
+        global _indexes_ensured
+        if self.db is not None:
+            return True
         try:
-            self.client = MongoClient(MONGO_URI)
-            self.db = self.client[DB_NAME]
+            client = _get_client()
             # Ping the database to verify connection
-            self.client.admin.command('ping')
-            print(f"Connected to MongoDB at {MONGO_URI}")
+            client.admin.command('ping')
+            self.client = client
+            self.db = client.get_database(DB_NAME, codec_options=CODEC_OPTIONS)
+            logger.debug("Connected to MongoDB at %s", MONGO_URI)
+            with _client_lock:
+                create_indexes, _indexes_ensured = not _indexes_ensured, True
+            if create_indexes:
+                self.ensure_indexes()
             return True
         except Exception as e:
-            print(f"Error connecting to MongoDB: {e}")
+            logger.error("Error connecting to MongoDB: %s", e)
             return False
     
+    def ensure_indexes(self) -> None:
+        """Create the `id` and `name` indexes used by lookups (idempotent)."""
+        for collection_name in INDEXED_COLLECTIONS:
+            self.create_indexes(collection_name)
+    
+    def create_indexes(self, collection_name: str, like: Optional[str] = None) -> None:
+        """Create the lookup indexes of collection `like` (default: the same name) on collection_name."""
+        like = like or collection_name
+        try:
+            self.db[collection_name].create_indexes([
+                # Sparse so legacy documents without an id don't collide on null
+                IndexModel([('id', ASCENDING)], unique=True, sparse=True),
+                IndexModel([('name', ASCENDING)]),
+            ])
+            if like == 'volumes':
+                # delete_server removes a server's volumes by attachment
+                self.db[collection_name].create_index([('attachments.server_id', ASCENDING)])
+        except Exception as e:
+            logger.error("Error creating indexes on %s: %s", collection_name, e)
+    
+    @contextmanager
+    def _writing(self, collection_name: str):
+        """Wrap a write: once it finishes (or fails), drop the collection's find_all cache and bump its generation."""
+        try:
+            yield
+        finally:
+            with self._cache_lock:
+                self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+                self._find_all_cache.pop(collection_name, None)
+    
     def get_collection(self, collection_name: str):
-        """Get a collection by name."""
-        if not self.db:
-            if not self.connect():
+        """Get a collection by name, caching the handle until the next connect."""
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            # pymongo Database/Collection objects refuse truth testing, so compare with None
+            if self.db is None and not self.connect():
                 return None
-        return self.db[collection_name]
+            collection = self._collections[collection_name] = self.db[collection_name]
+        return collection
     
     def find_all(self, collection_name: str) -> List[Dict[str, Any]]:
         """Find all documents in a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return []
-        return list(collection.find({}, {'_id': 0}))
+        cached = self._find_all_cache.get(collection_name)
+        if cached and time.monotonic() - cached[0] < FIND_ALL_TTL:
+            return list(cached[1])
+        generation = self._generations.get(collection_name, 0)
+        # Whole BSON batches are decoded in C by decode_all rather than one document per cursor step
+        documents = [doc for batch in collection.find_raw_batches({}, {'_id': 0})
+                     for doc in bson.decode_all(batch, CODEC_OPTIONS)]
+        with self._cache_lock:
+            # A write that finished during the read may or may not be in documents; don't cache them then
+            if self._generations.get(collection_name, 0) == generation:
+                self._find_all_cache[collection_name] = (time.monotonic(), documents)
+        return list(documents)
+    
+    def count(self, collection_name: str) -> int:
+        """Estimated number of documents in a collection, read from collection metadata."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return 0
+        return collection.estimated_document_count()
     
     def find_one(self, collection_name: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find a single document in a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return None
         result = collection.find_one(query, {'_id': 0})
         return result
     
+    def find_one_by_id_or_name(self, collection_name: str, value: str) -> Optional[Dict[str, Any]]:
+        """Find a single document whose id or name equals value."""
+        return self.find_one(collection_name, {'$or': [{'id': value}, {'name': value}]})
+    
     def insert_one(self, collection_name: str, document: Dict[str, Any]) -> Optional[str]:
         """Insert a document into a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return None
-        result = collection.insert_one(document)
+        # pymongo stamps _id onto the dict it is given; insert a shallow copy so the
+        # caller's document (FakeOpenStackAPI's in-memory cache) stays identical to find_all output
+        with self._writing(collection_name):
+            result = collection.insert_one(dict(document))
         return str(result.inserted_id) if result.acknowledged else None
     
     def insert_many(self, collection_name: str, documents: List[Dict[str, Any]]) -> int:
         """Insert multiple documents into a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
+            return 0
+        inserted = 0
+        with self._writing(collection_name):
+            for i in range(0, len(documents), INSERT_BATCH_SIZE):
+                batch = [dict(doc) for doc in documents[i:i + INSERT_BATCH_SIZE]]
+                result = collection.insert_many(batch, ordered=False)
+                inserted += len(result.inserted_ids) if result.acknowledged else 0
+        return inserted
+    
+    def bulk_replace(self, collection_name: str, documents: List[Dict[str, Any]], key: str = 'id') -> int:
+        """Upsert documents by key in one unordered bulk write."""
+        collection = self.get_collection(collection_name)
+        if collection is None or not documents:
             return 0
-        result = collection.insert_many(documents)
-        return len(result.inserted_ids) if result.acknowledged else 0
+        # Documents may still carry an _id from elsewhere; replacing with it would trip the immutable _id check
+        ops = [ReplaceOne({key: doc[key]}, {k: v for k, v in doc.items() if k != '_id'}, upsert=True)
+               for doc in documents]
+        written = 0
+        with self._writing(collection_name):
+            for i in range(0, len(ops), INSERT_BATCH_SIZE):
+                result = collection.bulk_write(ops[i:i + INSERT_BATCH_SIZE], ordered=False)
+                written += result.upserted_count + result.modified_count
+        return written
     
     def update_one(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
         """Update a single document in a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return False
-        result = collection.update_one(query, {'$set': update})
+        with self._writing(collection_name):
+            result = collection.update_one(query, {'$set': update})
         return result.modified_count > 0
     
+    def find_one_and_update(self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atomically $set fields on a single document and return it as updated, or None if nothing matched."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+        with self._writing(collection_name):
+            return collection.find_one_and_update(query, {'$set': update}, projection={'_id': 0},
+                                                  return_document=ReturnDocument.AFTER)
+    
     def delete_one(self, collection_name: str, query: Dict[str, Any]) -> bool:
         """Delete a single document from a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return False
-        result = collection.delete_one(query)
+        with self._writing(collection_name):
+            result = collection.delete_one(query)
         return result.deleted_count > 0
     
     def delete_many(self, collection_name: str, query: Dict[str, Any]) -> int:
         """Delete multiple documents from a collection."""
         collection = self.get_collection(collection_name)
-        if not collection:
+        if collection is None:
             return 0
-        result = collection.delete_many(query)
+        with self._writing(collection_name):
+            result = collection.delete_many(query)
         return result.deleted_count
     
+    def get_singleton(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch a collection's single document by its fixed _id."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+        # Data migrated before the fixed _id existed holds one document with a generated _id
+        return (collection.find_one({'_id': SINGLETON_ID}, {'_id': 0})
+                or collection.find_one({}, {'_id': 0}))
+    
+    def find_singleton_element(self, collection_name: str, field: str, value: str) -> Optional[Dict[str, Any]]:
+        """Fetch the first entry of the singleton's array field whose id or name equals value."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+        # $elemMatch projection returns only the matching array entry, not the whole array
+        match = {'$elemMatch': {'$or': [{'id': value}, {'name': value}]}}
+        for query in ({'_id': SINGLETON_ID, field: match}, {field: match}):
+            doc = collection.find_one(query, {'_id': 0, field: match})
+            if doc and doc.get(field):
+                return doc[field][0]
+        return None
+    
+    def set_singleton(self, collection_name: str, document: Dict[str, Any]) -> bool:
+        """Replace (or create) a collection's single document and drop any legacy ones."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return False
+        with self._writing(collection_name):
+            collection.replace_one({'_id': SINGLETON_ID}, {k: v for k, v in document.items() if k != '_id'}, upsert=True)
+            collection.delete_many({'_id': {'$ne': SINGLETON_ID}})
+        return True
+    
+    def seed_sequence(self, name: str, floor: int) -> bool:
+        """Raise a named counter to at least floor, creating it if needed."""
+        collection = self.get_collection('counters')
+        if collection is None:
+            return False
+        collection.update_one({'_id': name}, {'$max': {'value': floor}}, upsert=True)
+        return True
+    
+    def next_sequence(self, name: str) -> Optional[int]:
+        """Atomically increment a named counter and return its new value."""
+        collection = self.get_collection('counters')
+        if collection is None:
+            return None
+        doc = collection.find_one_and_update({'_id': name}, {'$inc': {'value': 1}},
+                                             upsert=True, return_document=ReturnDocument.AFTER)
+        return doc['value']
+    
+    def rename_collection(self, source: str, target: str) -> bool:
+        """Rename source to target in one step, replacing whatever target held."""
+        for name in (source, target):
+            self._collections.pop(name, None)
+        if self.db is None:
+            return False
+        try:
+            with self._writing(source), self._writing(target):
+                self.db[source].rename(target, dropTarget=True)
+            return True
+        except Exception as e:
+            logger.error("Error renaming collection %s to %s: %s", source, target, e)
+            return False
+    
     def drop_collection(self, collection_name: str) -> bool:
         """Drop an entire collection."""
-        if not self.db:
+        self._collections.pop(collection_name, None)
+        if self.db is None:
             return False
         try:
-            self.db.drop_collection(collection_name)
+            with self._writing(collection_name):
+                self.db.drop_collection(collection_name)
             return True
         except Exception as e:
-            print(f"Error dropping collection {collection_name}: {e}")
+            logger.error("Error dropping collection %s: %s", collection_name, e)
             return False
\ No newline at end of file
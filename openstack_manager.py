@@ -1,8 +1,17 @@
 import openstack
 import os
+import random
 import time # Import time for waiting
+import threading
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 load_dotenv()
+
+logger = logging.getLogger(__name__)
 # --- Load OpenStack Credentials --- 
 # It's recommended to use environment variables
 OS_AUTH_URL = os.environ.get("OS_AUTH_URL")
@@ -14,13 +23,139 @@ OS_USER_DOMAIN_NAME = os.environ.get("OS_USER_DOMAIN_NAME")
 OS_PROJECT_DOMAIN_NAME = os.environ.get("OS_PROJECT_DOMAIN_NAME")
 # ------------------------------------
 
+# HTTP connection pool for the SDK session; size it to roughly workers x concurrent OpenStack calls
+HTTP_POOL_CONNECTIONS = int(os.environ.get("OS_HTTP_POOL_CONNECTIONS", 20))
+HTTP_POOL_MAXSIZE = int(os.environ.get("OS_HTTP_POOL_MAXSIZE", 50))
+
+# Re-authenticate in the background this many seconds before the Keystone token expires
+TOKEN_REFRESH_MARGIN = int(os.environ.get("OS_TOKEN_REFRESH_MARGIN", 300))
+TOKEN_CHECK_INTERVAL = int(os.environ.get("OS_TOKEN_CHECK_INTERVAL", 60))
+
+# One authenticated connection per process, handed out by connect_to_openstack
+_shared_conn = None
+_conn_lock = threading.Lock()
+
+# Images are fetched this many per page, so the first results arrive without waiting for the whole catalogue
+IMAGE_PAGE_SIZE = int(os.environ.get("OS_IMAGE_PAGE_SIZE", 100))
+
+# Status polling for volume/server waits; tune for slow or fast clouds. The interval is the first
+# delay: each poll backs off 1.5x (plus jitter) up to POLL_MAX_INTERVAL
+POLL_INTERVAL = float(os.environ.get("OS_POLL_INTERVAL", 2))
+POLL_MAX_INTERVAL = float(os.environ.get("OS_POLL_MAX_INTERVAL", 30))
+POLL_TIMEOUT = int(os.environ.get("OS_POLL_TIMEOUT", 300))
+RESIZE_POLL_TIMEOUT = int(os.environ.get("OS_RESIZE_POLL_TIMEOUT", 600))
+
+# Servers with more attached volumes than this get one detailed volume listing instead of a GET per volume
+VOLUME_LISTING_THRESHOLD = int(os.environ.get("OS_VOLUME_LISTING_THRESHOLD", 5))
+
+# Resolved image/flavor/network IDs, keyed by (kind, name). They rarely change, so reuse them for a while
+LOOKUP_CACHE_TTL = int(os.environ.get("OS_LOOKUP_CACHE_TTL", 300))
+_lookup_cache = {}
+
+def _is_uuid(value):
+    """Returns True when value already parses as a UUID, so no name lookup is needed."""
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+def _resolve_id(kind, finder, name):
+    """Resolves a resource name (or UUID, returned as-is) to its ID, reusing a recent answer when there is one."""
+    if _is_uuid(name):
+        return name
+    key = (kind, name)
+    cached = _lookup_cache.get(key)
+    if cached and time.monotonic() - cached[1] < LOOKUP_CACHE_TTL:
+        return cached[0]
+    resource = finder(name)
+    if not resource:
+        _lookup_cache.pop(key, None)
+        return None
+    _lookup_cache[key] = (resource.id, time.monotonic())
+    return resource.id
+
+def _forget_ids(*keys):
+    """Drops cached IDs, e.g. after the cloud reports one of them no longer exists."""
+    for key in keys:
+        _lookup_cache.pop(key, None)
+
+def _remember_id(kind, name, resource_id):
+    """Caches an ID we already know (e.g. from a create call) so the next lookup by name is free."""
+    _lookup_cache[(kind, name)] = (resource_id, time.monotonic())
+
+def _tune_http_pool(conn):
+    """Mounts a larger keep-alive connection pool (with retries on idempotent calls) on the SDK's HTTP session."""
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    try:
+        conn.session.session.mount("https://", adapter)
+        conn.session.session.mount("http://", adapter)
+    except AttributeError as e:
+        logger.warning("Could not tune the HTTP connection pool, using SDK defaults: %s", e)
+
+def _refresh_token_periodically(conn):
+    """Fetches a new token shortly before the current one expires, so no request pays for re-auth."""
+    auth = conn.session.auth
+    while True:
+        time.sleep(TOKEN_CHECK_INTERVAL)
+        try:
+            auth_ref = auth.auth_ref
+            if auth_ref is None or auth_ref.will_expire_soon(stale_duration=TOKEN_REFRESH_MARGIN):
+                auth.invalidate()
+                auth.get_token(conn.session)
+        except Exception as e:
+            logger.warning("Background token refresh failed, requests will re-authenticate on demand: %s", e)
+
+def _start_token_refresher(conn):
+    """Starts the background token refresher for a connection."""
+    if not hasattr(getattr(conn.session, 'auth', None), 'invalidate'):
+        return
+    threading.Thread(target=_refresh_token_periodically, args=(conn,), name="os-token-refresh", daemon=True).start()
+
+def _wait_for_status(fetch, resource, status, failures, interval, wait):
+    """Polls fetch(resource.id) until it reports status, backing off exponentially with jitter.
+
+    Up to 30% jitter keeps concurrent waiters from polling the control plane in lockstep.
+    Raises ResourceFailure on a failure status and ResourceTimeout after `wait` seconds,
+    like the SDK's own wait helpers.
+    """
+    failures = {f.lower() for f in failures}
+    deadline = time.monotonic() + wait
+    delay = interval
+    while True:
+        resource = fetch(resource.id)
+        current = (resource.status or '').lower()
+        if current == status.lower():
+            return resource
+        if current in failures:
+            raise openstack.exceptions.ResourceFailure(
+                f"{resource.id} transitioned to failure state {resource.status}")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise openstack.exceptions.ResourceTimeout(
+                f"Timeout waiting for {resource.id} to transition to {status}")
+        time.sleep(min(delay + random.uniform(0, delay * 0.3), remaining))
+        delay = min(delay * 1.5, POLL_MAX_INTERVAL)
+
 def connect_to_openstack():
-    """Connects to OpenStack using credentials and returns a connection object."""
+    """Connects to OpenStack using credentials and returns a connection object.
+
+    The connection (and its pooled HTTP session) is shared by every caller in the process.
+    """
+    global _shared_conn
+    with _conn_lock:
+        if _shared_conn is None:
+            _shared_conn = _connect()
+        return _shared_conn
+
+def _connect():
+    """Opens a new authenticated connection, or returns None on failure."""
     try:
         # Optional: Enable logging for detailed debugging
         # openstack.enable_logging(debug=True)
 
-        print(f"Attempting to connect to OpenStack at: {OS_AUTH_URL}")
+        logger.info("Attempting to connect to OpenStack at: %s", OS_AUTH_URL)
         conn = openstack.connect(
             auth_url=OS_AUTH_URL,
             project_name=OS_PROJECT_NAME,
@@ -30,10 +165,12 @@ def connect_to_openstack():
             project_domain_name=OS_PROJECT_DOMAIN_NAME,
             # insecure=True # Uncomment if using self-signed certificates
         )
-        print("OpenStack Connection Successful!")
+        _tune_http_pool(conn)
+        _start_token_refresher(conn)
+        logger.info("OpenStack Connection Successful!")
         return conn
     except Exception as e:
-        print(f"Error connecting to OpenStack: {e}")
+        logger.error("Error connecting to OpenStack: %s", e)
         # Consider raising the exception or handling it more robustly
         return None
 
@@ -42,79 +179,87 @@ def connect_to_openstack():
 def list_servers(conn):
     """Lists all servers (VM instances) in the project."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return []
     try:
-        print("Listing servers...")
+        logger.info("Listing servers...")
         servers = list(conn.compute.servers())
         if not servers:
-            print("No servers found.")
+            logger.info("No servers found.")
         return servers
     except Exception as e:
-        print(f"Error listing servers: {e}")
+        logger.error("Error listing servers: %s", e)
         return []
 
 def list_images(conn):
     """Lists available images."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return []
     try:
-        print("Listing images...")
-        images = list(conn.image.images())
+        logger.info("Listing images...")
+        images = list(conn.image.images(limit=IMAGE_PAGE_SIZE))
         if not images:
-            print("No images found.")
+            logger.info("No images found.")
         return images
     except Exception as e:
-        print(f"Error listing images: {e}")
+        logger.error("Error listing images: %s", e)
         return []
 
-def create_server(conn, name, image_name, flavor_name, network_name='default', volume_size=None): # Added volume_size
-    """Creates a new server (VM instance), optionally booting from a volume."""
+def create_server(conn, name, image_name, flavor_name, network_name='default', volume_size=None, # Added volume_size
+                  poll_interval=POLL_INTERVAL, poll_timeout=POLL_TIMEOUT):
+    """Creates a new server (VM instance), optionally booting from a volume.
+
+    image_name, flavor_name and network_name may each be a name or a UUID; UUIDs skip the lookup.
+    """
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return None
     try:
-        print(f"Attempting to create server '{name}'...")
-
-        # Find the image, flavor, and network by name
-        image = conn.compute.find_image(image_name)
-        flavor = conn.compute.find_flavor(flavor_name)
-        network = conn.network.find_network(network_name)
-
-        if not image:
-            print(f"Error: Image '{image_name}' not found.")
+        logger.info("Attempting to create server '%s'...", name)
+
+        # Find the image, flavor, and network by name (cached across calls); the lookups are
+        # independent, so any that miss the cache run concurrently
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            image_future = pool.submit(_resolve_id, 'image', conn.compute.find_image, image_name)
+            flavor_future = pool.submit(_resolve_id, 'flavor', conn.compute.find_flavor, flavor_name)
+            network_future = pool.submit(_resolve_id, 'network', conn.network.find_network, network_name)
+        image_id, flavor_id, network_id = image_future.result(), flavor_future.result(), network_future.result()
+
+        if not image_id:
+            logger.error("Image '%s' not found.", image_name)
             return None
-        if not flavor:
-            print(f"Error: Flavor '{flavor_name}' not found.")
+        if not flavor_id:
+            logger.error("Flavor '%s' not found.", flavor_name)
             return None
-        if not network:
-             print(f"Error: Network '{network_name}' not found.")
+        if not network_id:
+             logger.error("Network '%s' not found.", network_name)
              return None
 
-        print(f"  Using Image: {image.id}")
-        print(f"  Using Flavor: {flavor.id}")
-        print(f"  Using Network: {network.id}")
+        logger.debug("Using Image: %s", image_id)
+        logger.debug("Using Flavor: %s", flavor_id)
+        logger.debug("Using Network: %s", network_id)
 
         server_params = {
             'name': name,
-            'flavor_id': flavor.id,
-            'networks': [{"uuid": network.id}]
+            'flavor_id': flavor_id,
+            'networks': [{"uuid": network_id}]
             # You might need to add key_name for SSH access:
             # 'key_name': 'your-keypair-name'
         }
 
         if volume_size:
-            print(f"  Creating bootable volume of size {volume_size} GB from image {image.id}...")
+            logger.debug("Creating bootable volume of size %s GB from image %s...", volume_size, image_id)
             volume = conn.block_storage.create_volume(
                 name=f"{name}-boot-volume",
                 size=volume_size,
-                imageRef=image.id,
+                imageRef=image_id,
                 # bootable=True # Often implied by imageRef, but can be explicit
             )
             # Wait for volume to be available
-            conn.block_storage.wait_for_status(volume, status='available', failures=['error'], interval=5, wait=300)
-            print(f"  Volume {volume.id} created and available.")
+            _wait_for_status(conn.block_storage.get_volume, volume, 'available', ['error'],
+                             poll_interval, poll_timeout)
+            logger.debug("Volume %s created and available.", volume.id)
 
             # Prepare block device mapping for booting from volume
             bdm = [
@@ -130,43 +275,51 @@ def create_server(conn, name, image_name, flavor_name, network_name='default', v
             # Do not specify image_id when booting from volume
         else:
             # Boot directly from image (original behavior)
-            server_params['image_id'] = image.id
+            server_params['image_id'] = image_id
 
         # Create the server
-        print(f"  Submitting server creation request...")
+        logger.debug("Submitting server creation request...")
         server = conn.compute.create_server(**server_params)
 
         # Wait for the server to become active (optional, can take time)
         # server = conn.compute.wait_for_server(server)
 
-        print(f"Server '{name}' creation initiated. ID: {server.id}, Status: {server.status}")
+        logger.info("Server '%s' creation initiated. ID: %s, Status: %s", name, server.id, server.status)
         return server
 
     except Exception as e:
-        print(f"Error creating server '{name}': {e}")
+        logger.error("Error creating server '%s': %s", name, e)
+        if isinstance(e, openstack.exceptions.ResourceNotFound):
+            # A cached ID may be stale; resolve the names again next time
+            _forget_ids(('image', image_name), ('flavor', flavor_name), ('network', network_name))
         # Clean up volume if creation failed after volume was made
         if 'volume' in locals() and volume:
             try:
-                print(f"  Attempting to delete volume {volume.id} due to server creation error...")
+                logger.debug("Attempting to delete volume %s due to server creation error...", volume.id)
                 conn.block_storage.delete_volume(volume)
             except Exception as ve:
-                print(f"  Warning: Failed to delete volume {volume.id} after error: {ve}")
+                logger.warning("Failed to delete volume %s after error: %s", volume.id, ve)
         return None
 
 def delete_server(conn, server_to_delete):
-    """Deletes a server (VM instance) given its object or ID."""
+    """Deletes a server (VM instance) given its object, ID or name."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return False
 
     server_id = None
     server_name = "Unknown"
-    if isinstance(server_to_delete, str):
+    if isinstance(server_to_delete, str) and _is_uuid(server_to_delete):
+        # Already an ID: delete directly rather than spending a GET on the name for logging
+        server_id = server_to_delete
+        server_name = server_to_delete
+    elif isinstance(server_to_delete, str):
         server_id = server_to_delete
-        # Try to find the server to get its name for logging
+        # A name has to be resolved to the ID the delete call needs
         try:
-            found_server = conn.compute.find_server(server_id)
+            found_server = conn.compute.find_server(server_to_delete)
             if found_server:
+                server_id = found_server.id
                 server_name = found_server.name
         except Exception:
             pass # Ignore if finding fails, proceed with deletion by ID
@@ -174,22 +327,22 @@ def delete_server(conn, server_to_delete):
         server_id = server_to_delete.id
         server_name = server_to_delete.name
     else:
-        print("Error: Invalid input for server_to_delete. Provide server object or ID string.")
+        logger.error("Invalid input for server_to_delete. Provide server object or ID string.")
         return False
 
-    print(f"Attempting to delete server '{server_name}' (ID: {server_id})...")
+    logger.info("Attempting to delete server '%s' (ID: %s)...", server_name, server_id)
     try:
         # The 'wait' parameter is not valid for conn.compute.delete_server
         # Deletion is inherently asynchronous in the SDK call itself.
         # If waiting is needed, it should be implemented separately by polling the server status.
         conn.compute.delete_server(server_id)
-        print(f"Server '{server_name}' (ID: {server_id}) deleted successfully.")
+        logger.info("Server '%s' (ID: %s) deleted successfully.", server_name, server_id)
         return True
     except openstack.exceptions.ResourceNotFound:
-        print(f"Server '{server_name}' (ID: {server_id}) not found. Perhaps already deleted?")
+        logger.info("Server '%s' (ID: %s) not found. Perhaps already deleted?", server_name, server_id)
         return True # Consider it success if not found
     except Exception as e:
-        print(f"Error deleting server '{server_name}' (ID: {server_id}): {e}")
+        logger.error("Error deleting server '%s' (ID: %s): %s", server_name, server_id, e)
         return False
 
 # --- New Functions ---
@@ -197,15 +350,16 @@ def delete_server(conn, server_to_delete):
 def create_network_with_subnet(conn, network_name, subnet_cidr="192.168.100.0/24", subnet_name=None):
     """Creates a private network and subnet, returns network and subnet objects."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return None, None
     try:
-        print(f"Creating network '{network_name}'...")
+        logger.info("Creating network '%s'...", network_name)
         network = conn.network.create_network(name=network_name)
-        print(f"  Network created: ID={network.id}, Name={network.name}")
+        logger.debug("Network created: ID=%s, Name=%s", network.id, network.name)
+        _remember_id('network', network_name, network.id)
         if not subnet_name:
             subnet_name = f"{network_name}-subnet"
-        print(f"Creating subnet '{subnet_name}' with CIDR {subnet_cidr}...")
+        logger.info("Creating subnet '%s' with CIDR %s...", subnet_name, subnet_cidr)
         subnet = conn.network.create_subnet(
             name=subnet_name,
             network_id=network.id,
@@ -213,60 +367,61 @@ def create_network_with_subnet(conn, network_name, subnet_cidr="192.168.100.0/24
             cidr=subnet_cidr,
             enable_dhcp=True
         )
-        print(f"  Subnet created: ID={subnet.id}, Name={subnet.name}, CIDR={subnet.cidr}")
+        logger.debug("Subnet created: ID=%s, Name=%s, CIDR=%s", subnet.id, subnet.name, subnet.cidr)
         return network, subnet
     except Exception as e:
-        print(f"Error creating network or subnet: {e}")
+        logger.error("Error creating network or subnet: %s", e)
         return None, None
 
-def resize_server(conn, server, flavor_name):
-    """Resizes a server to a new flavor and confirms the resize."""
+def resize_server(conn, server, flavor_name, poll_interval=POLL_INTERVAL, poll_timeout=RESIZE_POLL_TIMEOUT):
+    """Resizes a server to a new flavor (name or UUID) and confirms the resize."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return False
     try:
-        print(f"Attempting to resize server '{server.name}' (ID: {server.id}) to flavor '{flavor_name}'...")
-        flavor = conn.compute.find_flavor(flavor_name)
-        if not flavor:
-            print(f"Error: Flavor '{flavor_name}' not found.")
+        logger.info("Attempting to resize server '%s' (ID: %s) to flavor '%s'...", server.name, server.id, flavor_name)
+        flavor_id = _resolve_id('flavor', conn.compute.find_flavor, flavor_name)
+        if not flavor_id:
+            logger.error("Flavor '%s' not found.", flavor_name)
             return False
 
-        print(f"  Found target flavor: {flavor.id}")
-        conn.compute.resize_server(server, flavor.id)
+        logger.debug("Found target flavor: %s", flavor_id)
+        conn.compute.resize_server(server, flavor_id)
 
         # Wait for the server to reach VERIFY_RESIZE status
-        print("  Waiting for server to reach VERIFY_RESIZE status...")
-        conn.compute.wait_for_server(server, status='VERIFY_RESIZE', failures=['ERROR'], interval=5, wait=600)
-        print(f"  Server '{server.name}' is ready for resize confirmation.")
+        logger.debug("Waiting for server to reach VERIFY_RESIZE status...")
+        _wait_for_status(conn.compute.get_server, server, 'VERIFY_RESIZE', ['ERROR'],
+                         poll_interval, poll_timeout)
+        logger.debug("Server '%s' is ready for resize confirmation.", server.name)
 
         # Confirm the resize
-        print("  Confirming resize...")
+        logger.debug("Confirming resize...")
         conn.compute.confirm_server_resize(server)
 
         # Optional: Wait for the server to become ACTIVE again after confirmation
         # print("  Waiting for server to become ACTIVE after resize...")
         # conn.compute.wait_for_server(server, status='ACTIVE', failures=['ERROR'], interval=5, wait=300)
 
-        print(f"Server '{server.name}' successfully resized to flavor '{flavor_name}'.")
+        logger.info("Server '%s' successfully resized to flavor '%s'.", server.name, flavor_name)
         return True
 
     except Exception as e:
-        print(f"Error resizing server '{server.name}': {e}")
+        logger.error("Error resizing server '%s': %s", server.name, e)
         # Attempt to revert resize if possible (might not always work depending on state)
         try:
-            print("  Attempting to revert resize...")
+            logger.debug("Attempting to revert resize...")
             conn.compute.revert_server_resize(server)
         except Exception as re:
-            print(f"  Warning: Failed to revert resize: {re}")
+            logger.warning("Failed to revert resize: %s", re)
         return False
 
-def create_volume(conn, name, size_gb):
+def create_volume(conn, name, size_gb, poll_interval=POLL_INTERVAL, poll_timeout=POLL_TIMEOUT):
     """Creates a standalone Cinder volume."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return None
     try:
-        print(f"Attempting to create volume '{name}' of size {size_gb} GB...")
+        logger.info("Attempting to create volume '%s' of size %s GB...", name, size_gb)
         volume = conn.block_storage.create_volume(
             name=name,
             size=size_gb
@@ -274,29 +429,37 @@ def create_volume(conn, name, size_gb):
             # 'volume_type': 'your_volume_type'
         )
         # Wait for the volume to become available
-        print(f"  Waiting for volume '{name}' (ID: {volume.id}) to become available...")
-        conn.block_storage.wait_for_status(volume, status='available', failures=['error'], interval=5, wait=300)
-        print(f"Volume '{name}' (ID: {volume.id}) created successfully.")
+        logger.debug("Waiting for volume '%s' (ID: %s) to become available...", name, volume.id)
+        _wait_for_status(conn.block_storage.get_volume, volume, 'available', ['error'],
+                         poll_interval, poll_timeout)
+        logger.info("Volume '%s' (ID: %s) created successfully.", name, volume.id)
         return volume
     except Exception as e:
-        print(f"Error creating volume '{name}': {e}")
+        logger.error("Error creating volume '%s': %s", name, e)
         return None
 
 def delete_volume(conn, volume_name_or_id):
-    """Deletes a standalone Cinder volume by name or ID."""
+    """Deletes a standalone Cinder volume by name or ID; IDs are deleted without a lookup."""
     if not conn:
-        print("Error: Not connected to OpenStack.")
+        logger.error("Not connected to OpenStack.")
         return False
     try:
-        print(f"Attempting to find volume '{volume_name_or_id}' for deletion...")
+        if _is_uuid(volume_name_or_id):
+            # Already-deleted volumes count as success, so let the SDK ignore a 404 instead of raising
+            logger.info("Attempting to delete volume (ID: %s)...", volume_name_or_id)
+            conn.block_storage.delete_volume(volume_name_or_id, ignore_missing=True)
+            logger.info("Volume (ID: %s) deletion initiated successfully.", volume_name_or_id)
+            return True
+
+        logger.info("Attempting to find volume '%s' for deletion...", volume_name_or_id)
         volume = conn.block_storage.find_volume(volume_name_or_id, ignore_missing=False)
         if not volume:
              # find_volume raises ResourceNotFound if ignore_missing=False and not found
              # This part might not be reached if ResourceNotFound is caught below
-             print(f"Error: Volume '{volume_name_or_id}' not found.")
+             logger.error("Volume '%s' not found.", volume_name_or_id)
              return False
 
-        print(f"  Found volume '{volume.name}' (ID: {volume.id}). Attempting deletion...")
+        logger.debug("Found volume '%s' (ID: %s). Attempting deletion...", volume.name, volume.id)
         conn.block_storage.delete_volume(volume)
         # Optional: Wait for deletion confirmation (volume status becomes 'deleting' then disappears)
         # try:
@@ -307,69 +470,177 @@ def delete_volume(conn, volume_name_or_id):
         # except Exception as we:
         #     print(f"  Warning: Error waiting for volume deletion confirmation: {we}")
 
-        print(f"Volume '{volume.name}' (ID: {volume.id}) deletion initiated successfully.")
+        logger.info("Volume '%s' (ID: %s) deletion initiated successfully.", volume.name, volume.id)
         return True
     except openstack.exceptions.ResourceNotFound:
-        print(f"Volume '{volume_name_or_id}' not found. Perhaps already deleted?")
+        logger.info("Volume '%s' not found. Perhaps already deleted?", volume_name_or_id)
         return True # Consider it success if not found
     except Exception as e:
-        print(f"Error deleting volume '{volume_name_or_id}': {e}")
+        logger.error("Error deleting volume '%s': %s", volume_name_or_id, e)
         return False
 
+def _roll_back_full_stack(conn, name, result):
+    """Deletes whatever create_full_stack made before its server step failed, and clears result."""
+    logger.info("Rolling back full stack for '%s'...", name)
+    deletions = [('volume', conn.block_storage.delete_volume),
+                 ('subnet', conn.network.delete_subnet),  # Before its network, which can't go while it has subnets
+                 ('network', conn.network.delete_network)]
+    for kind, delete in deletions:
+        resource = result[kind]
+        if not resource:
+            continue
+        try:
+            delete(resource, ignore_missing=True)
+            logger.debug("Deleted %s %s.", kind, resource.id)
+        except Exception as e:
+            logger.warning("Failed to delete %s %s while rolling back '%s': %s", kind, resource.id, name, e)
+        result[kind] = None
+    _forget_ids(('network', f"{name}-net"))
+
+def create_full_stack(conn, spec, poll_interval=POLL_INTERVAL, poll_timeout=POLL_TIMEOUT):
+    """Provisions a network with subnet, an optional data volume and a server on that network.
+
+    spec keys: 'name', 'image', 'flavor' (names or UUIDs), and optionally 'subnet_cidr',
+    'boot_volume_size' and 'data_volume_size'. Independent steps run concurrently: the image and
+    flavor lookups, the network and the data volume. The data volume is attached once the server
+    is ACTIVE. Returns a dict of 'network', 'subnet', 'volume' and 'server'. If the server can't be
+    created, the network, subnet and volume made for it are deleted again and every entry is None.
+    """
+    result = {'network': None, 'subnet': None, 'volume': None, 'server': None}
+    if not conn:
+        logger.error("Not connected to OpenStack.")
+        return result
+    name = spec['name']
+    logger.info("Provisioning full stack for '%s'...", name)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        # Warm the ID cache for create_server while the network and volume are being created
+        lookups = [pool.submit(_resolve_id, 'image', conn.compute.find_image, spec['image']),
+                   pool.submit(_resolve_id, 'flavor', conn.compute.find_flavor, spec['flavor'])]
+        network_future = pool.submit(create_network_with_subnet, conn, f"{name}-net",
+                                     spec.get('subnet_cidr', "192.168.100.0/24"))
+        volume_future = None
+        if spec.get('data_volume_size'):
+            volume_future = pool.submit(create_volume, conn, f"{name}-data", spec['data_volume_size'],
+                                        poll_interval, poll_timeout)
+        try:
+            for lookup in lookups:
+                lookup.result()
+        except Exception as e:
+            logger.warning("Image/flavor lookup failed, create_server will retry it: %s", e)
+        result['network'], result['subnet'] = network_future.result()
+        if result['network']:
+            result['server'] = create_server(conn, name, spec['image'], spec['flavor'], result['network'].id,
+                                             volume_size=spec.get('boot_volume_size'),
+                                             poll_interval=poll_interval, poll_timeout=poll_timeout)
+        if volume_future:
+            result['volume'] = volume_future.result()
+
+    if not result['server']:
+        _roll_back_full_stack(conn, name, result)
+        return result
+
+    if result['volume']:
+        try:
+            logger.debug("Waiting for server '%s' to become ACTIVE before attaching its data volume...", name)
+            server = _wait_for_status(conn.compute.get_server, result['server'], 'ACTIVE', ['ERROR'],
+                                      poll_interval, poll_timeout)
+            conn.compute.create_volume_attachment(server, volume_id=result['volume'].id)
+            logger.debug("Volume %s attached to server '%s'.", result['volume'].id, name)
+        except Exception as e:
+            logger.warning("Failed to attach volume %s to server '%s': %s", result['volume'].id, name, e)
+    return result
+
 # manager_module.py
 import openstack
 
+# The five main resources reported by manager_get_usage: (label, used limit key, max limit key)
+PROJECT_QUOTA_KEYS = (
+    ('cores',     'totalCoresUsed',     'maxTotalCores'),
+    ('ram (MB)',  'totalRAMUsed',       'maxTotalRAMSize'),
+    ('instances', 'totalInstancesUsed', 'maxTotalInstances'),
+    ('volumes',   'totalVolumesUsed',   'maxTotalVolumes'),
+    ('gigabytes', 'totalGigabytesUsed', 'maxTotalVolumeGigabytes'),
+)
+
+def _fetch_attached_volumes(conn, pool, volume_ids):
+    """Starts fetching volumes on pool; returns a callable that waits and maps id -> volume.
+
+    A few volumes are fetched with one GET each. Beyond VOLUME_LISTING_THRESHOLD, a single
+    detailed listing is cheaper, even though it pages through every volume in the project.
+    """
+    if len(volume_ids) > VOLUME_LISTING_THRESHOLD:
+        listing = pool.submit(lambda: {vol.id: vol for vol in conn.block_storage.volumes(details=True)})
+        return listing.result
+    futures = {vol_id: pool.submit(conn.block_storage.get_volume, vol_id) for vol_id in volume_ids}
+
+    def collect():
+        volumes = {}
+        for vol_id, future in futures.items():
+            try:
+                volumes[vol_id] = future.result()
+            except Exception:
+                pass  # Reported as "details unavailable"
+        return volumes
+    return collect
+
 def manager_get_usage(conn, server_id_or_name=None):
     """Prints usage for a specific server alongside overall project quotas & usage."""
     if not conn:
         print("Error: Not connected to OpenStack.")
         return
 
-    # First, fetch project limits
-    limits = conn.compute.get_limits().absolute
-    # We're interested in these five main resources:
-    pu = {
-        'cores':    ('totalCoresUsed', 'maxTotalCores'),
-        'ram (MB)': ('totalRAMUsed', 'maxTotalRAMSize'),
-        'instances':('totalInstancesUsed', 'maxTotalInstances'),
-        'volumes':  ('totalVolumesUsed', 'maxTotalVolumes'),
-        'gigabytes':('totalGigabytesUsed', 'maxTotalVolumeGigabytes'),
-    }
-
-    # If server was specified, show instance details first
-    if server_id_or_name:
-        print(f"\n--- Usage for Instance: {server_id_or_name} ---")
-        server = conn.compute.find_server(server_id_or_name)
-        if not server:
-            print(f"  Server '{server_id_or_name}' not found.\n")
-        else:
-            server = conn.compute.get_server(server.id)
-            print(f"  Name:   {server.name}")
-            print(f"  ID:     {server.id}")
-            print(f"  Status: {server.status}")
-            # Flavor info
-            flavor_id   = server.flavor['id']
-            try:
-                flavor = conn.compute.get_flavor(flavor_id)
-                print(f"  Flavor: {flavor.name} (ID: {flavor.id})")
-                print(f"    vCPUs:      {flavor.vcpus}")
-                print(f"    RAM:        {flavor.ram} MB")
-                print(f"    Root Disk:  {flavor.disk} GB")
-            except Exception:
-                print(f"  Flavor ID: {flavor_id} (details unavailable)")
-
-            # Attached volumes
-            if server.attached_volumes:
-                print("  Attached Volumes:")
-                for att in server.attached_volumes:
-                    vol = conn.block_storage.get_volume(att['id'])
-                    print(f"    - {vol.name} (ID: {vol.id}): {vol.size} GB, status={vol.status}")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # Project limits, flavor details and the attached volumes are independent GETs, so they overlap
+        limits_future = pool.submit(lambda: conn.compute.get_limits().absolute)
+
+        # If server was specified, show instance details first
+        if server_id_or_name:
+            print(f"\n--- Usage for Instance: {server_id_or_name} ---")
+            server = conn.compute.find_server(server_id_or_name, ignore_missing=True)
+            if not server:
+                print(f"  Server '{server_id_or_name}' not found.\n")
             else:
-                print("  No volumes attached.")
+                # find_server usually returns a populated server; fetch it again only when it didn't
+                if not server.flavor:
+                    server = conn.compute.get_server(server.id)
+                flavor_id   = server.flavor['id']
+                flavor_future = pool.submit(conn.compute.get_flavor, flavor_id)
+                attached_volumes = None
+                if server.attached_volumes:
+                    attached_volumes = _fetch_attached_volumes(
+                        conn, pool, [att['id'] for att in server.attached_volumes])
+
+                print(f"  Name:   {server.name}")
+                print(f"  ID:     {server.id}")
+                print(f"  Status: {server.status}")
+                # Flavor info
+                try:
+                    flavor = flavor_future.result()
+                    print(f"  Flavor: {flavor.name} (ID: {flavor.id})")
+                    print(f"    vCPUs:      {flavor.vcpus}")
+                    print(f"    RAM:        {flavor.ram} MB")
+                    print(f"    Root Disk:  {flavor.disk} GB")
+                except Exception:
+                    print(f"  Flavor ID: {flavor_id} (details unavailable)")
+
+                # Attached volumes
+                if attached_volumes:
+                    print("  Attached Volumes:")
+                    volumes = attached_volumes()
+                    for att in server.attached_volumes:
+                        vol = volumes.get(att['id'])
+                        if vol is None:
+                            print(f"    - ID: {att['id']} (details unavailable)")
+                            continue
+                        print(f"    - {vol.name} (ID: {vol.id}): {vol.size} GB, status={vol.status}")
+                else:
+                    print("  No volumes attached.")
+
+        limits = limits_future.result()
 
     # Now show project quotas vs usage
     print("\n--- Project Quotas & Current Usage ---")
-    for label, (used_key, max_key) in pu.items():
+    for label, used_key, max_key in PROJECT_QUOTA_KEYS:
         used = limits.get(used_key, 'N/A')
         quota = limits.get(max_key, 'N/A')
         print(f"  {label:10}: {used} / {quota}")
@@ -378,6 +649,7 @@ def manager_get_usage(conn, server_id_or_name=None):
 
 # Example usage (for testing this module directly)
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
     print("Testing OpenStack Manager Module...")
     connection = connect_to_openstack()
     if connection:
@@ -388,7 +660,7 @@ if __name__ == "__main__":
         list_images(connection)
 
         print("\n--- Testing Usage Query ---")
-        get_project_usage(connection)
+        manager_get_usage(connection)
 
         # Add tests for new functions here if desired, e.g.:
         # print("\n--- Testing Volume Creation ---")
@@ -396,8 +668,6 @@ if __name__ == "__main__":
         # if test_vol:
         #     print("\n--- Testing Volume Deletion ---")
         #     delete_volume(connection, test_vol.id)
-        print("\n--- Testing Image Listing ---")
-        list_images(connection)
         # print("\n--- Testing Server Creation (Example - Disabled by default) ---")
         # create_server(connection, 'test-from-manager', 'Ubuntu-22.04-LTS', 'standard.small') # Replace with valid names
     else:
@@ -7,12 +7,30 @@ that allow a frontend to interact with the OpenStackAgent.
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import json
 import sys
 import os
+import re
+import time
 import uuid
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 # Add the parent directory to sys.path to allow imports from agent.py and api.py
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,7 +45,29 @@ except ImportError as e:
     print("Please ensure agent.py is in the correct path and all dependencies are installed.")
     OpenStackAgent = None
 
-app = FastAPI(title="OpenStack AI Command Center")
+# The OpenStack Agent is built on startup rather than at import, so that under gunicorn each
+# worker process creates its own agent and OpenStack connection after forking
+openstack_agent = None
+
+def init_openstack_agent():
+    """Initialize the OpenStack Agent for this worker."""
+    global openstack_agent
+    if not OpenStackAgent:
+        print("OpenStackAgent could not be initialized. API endpoints will not function correctly.")
+        return
+    agent = OpenStackAgent()
+    if hasattr(agent, 'openstack_api') and hasattr(agent.openstack_api, 'connect'):
+        if not agent.openstack_api.connect():
+            print("Failed to connect to OpenStack via agent on startup.")
+            return
+    openstack_agent = agent
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_openstack_agent()
+    yield
+
+app = FastAPI(title="OpenStack AI Command Center", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -37,28 +77,145 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# List results and formatted tables compress well; small bodies aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Initialize the OpenStack Agent
-if OpenStackAgent:
-    openstack_agent = OpenStackAgent()
-    if hasattr(openstack_agent, 'openstack_api') and hasattr(openstack_agent.openstack_api, 'connect'):
-        if not openstack_agent.openstack_api.connect():
-            print("Failed to connect to OpenStack via agent on startup.")
-            openstack_agent = None
-else:
-    openstack_agent = None
-    print("OpenStackAgent could not be initialized. API endpoints will not function correctly.")
+# process_user_query blocks on LLM and OpenStack calls; run it off the event loop so one slow
+# command doesn't stall every other request
+agent_executor = ThreadPoolExecutor(max_workers=int(os.getenv("AGENT_THREADS", "32")))
+
+# Only queries that read state are coalesced; anything that may create, delete or change a
+# resource always runs on its own, even if an identical one is in flight
+READ_ONLY_QUERY = re.compile(r"^(list|show|get|display|describe|view)\b|\b(usage|status)\b", re.IGNORECASE)
+MUTATING_QUERY = re.compile(
+    r"\b(create|delete|remove|destroy|terminate|resize|launch|make|add|attach|detach|update|rename|"
+    r"reboot|start|stop|boot|build|set)\b", re.IGNORECASE)
+
+def coalescing_key(user_query: str) -> Optional[str]:
+    """Key under which identical concurrent queries share one agent call, or None if it mustn't be shared.
+
+    Only whitespace is normalized: OpenStack resource names are case-sensitive.
+    """
+    query = " ".join(user_query.split())
+    if READ_ONLY_QUERY.search(query) and not MUTATING_QUERY.search(query):
+        return query
+    return None
+
+# Coalescing key -> the agent call already running for it
+in_flight_queries: Dict[str, "asyncio.Future"] = {}
+
+async def run_agent_query(user_query: str) -> Any:
+    """Run the agent on user_query, joining an identical read-only query that is already in flight."""
+    key = coalescing_key(user_query)
+    if key is None:
+        return await asyncio.get_running_loop().run_in_executor(
+            agent_executor, openstack_agent.process_user_query, user_query)
+    future = in_flight_queries.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(
+            agent_executor, openstack_agent.process_user_query, user_query)
+        in_flight_queries[key] = future
+        future.add_done_callback(lambda done: in_flight_queries.pop(key, None)
+                                 if in_flight_queries.get(key) is done else None)
+    # Shielded so one client disconnecting doesn't cancel the call for the others waiting on it
+    return await asyncio.shield(future)
+
+class PendingConfirmations:
+    """Confirmation ID -> action store that forgets entries after `ttl` seconds and keeps at most `maxsize`.
+
+    Every entry gets the same TTL, so insertion order is expiry order and expired entries are
+    always at the front.
+    """
 
-# In-memory store for pending confirmations
-pending_confirmations = {}
+    def __init__(self, maxsize: int = 2048, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._items and next(iter(self._items.values()))[0] <= now:
+            self._items.popitem(last=False)
+
+    def __setitem__(self, key: str, value: Any):
+        self._expire()
+        self._items.pop(key, None)
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        self._expire()
+        return key in self._items
+
+    def __getitem__(self, key: str) -> Any:
+        self._expire()
+        return self._items[key][1]
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        self._expire()
+        item = self._items.pop(key, None)
+        return default if item is None else item[1]
+
+CONFIRMATION_TTL = int(os.getenv("CONFIRMATION_TTL", "600"))
+
+# Pending confirmations; abandoned ones expire instead of accumulating for the life of the process.
+# With REDIS_URL set they live in Redis so any worker can complete a confirmation another one issued.
+pending_confirmations = PendingConfirmations(
+    maxsize=int(os.getenv("CONFIRMATION_MAXSIZE", "2048")),
+    ttl=CONFIRMATION_TTL,
+)
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL and aioredis is None:
+    print("REDIS_URL is set but the redis package is not installed; keeping confirmations in-process.")
+confirmation_store = aioredis.Redis.from_url(REDIS_URL) if REDIS_URL and aioredis else None
+
+async def save_confirmation(confirmation_id: str, action: Any):
+    """Remember the action awaiting confirmation_id until it is confirmed or expires."""
+    if confirmation_store is not None:
+        await confirmation_store.setex(f"conf:{confirmation_id}", CONFIRMATION_TTL, json.dumps(action))
+    else:
+        pending_confirmations[confirmation_id] = action
+
+async def take_confirmation(confirmation_id: str) -> Any:
+    """Remove and return the action for confirmation_id, or None if it is unknown or expired."""
+    if confirmation_store is not None:
+        # GETDEL is atomic, so two workers can't both run the same confirmed action
+        stored = await confirmation_store.getdel(f"conf:{confirmation_id}")
+        return None if stored is None else json.loads(stored)
+    return pending_confirmations.pop(confirmation_id)
 
 # Pydantic models for request validation
 class CommandRequest(BaseModel):
     query: str
     params: Optional[Dict[str, Any]] = {}
 
-@app.post("/api/command")
-async def handle_command(command: CommandRequest):
+# Declared response models let FastAPI encode responses straight to JSON bytes through Pydantic,
+# without a custom response class; unset fields are left out, so each response keeps its shape
+class CommandResponse(BaseModel):
+    result: Any = None
+    status: Optional[str] = None
+    confirmation_id: Optional[str] = None
+    message: Optional[str] = None
+
+class StatusResponse(BaseModel):
+    status: str
+    agent_initialized: bool
+    openstack_connected: bool
+
+NDJSON = "application/x-ndjson"
+
+def ndjson_rows(rows: List[Any]) -> Iterator[bytes]:
+    """Yield each row as one JSON line, so the first rows go out before the rest are encoded."""
+    for row in rows:
+        if orjson:
+            # OPT_NON_STR_KEYS matches json.dumps, which stringifies int/None keys instead of raising
+            yield orjson.dumps(row, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+        else:
+            yield json.dumps(row, default=str).encode() + b"\n"
+
+@app.post("/api/command", response_model=CommandResponse, response_model_exclude_unset=True)
+async def handle_command(command: CommandRequest, request: Request):
     """Handles natural language commands to interact with OpenStack."""
     if not openstack_agent:
         raise HTTPException(
@@ -75,38 +232,42 @@ async def handle_command(command: CommandRequest):
         if params.get('confirmation_id') and params.get('confirmed') is True:
             # Retrieve the pending command
             confirmation_id = params.get('confirmation_id')
-            if confirmation_id not in pending_confirmations:
+            # Get the command/action to execute; taking it up front means it can only run once
+            action_to_execute = await take_confirmation(confirmation_id)
+            if action_to_execute is None:
                 raise HTTPException(
                     status_code=400,
                     detail="Invalid or expired confirmation ID."
                 )
 
-            # Get the command/action to execute
-            action_to_execute = pending_confirmations[confirmation_id]
-            command_output = openstack_agent.process_user_query(action_to_execute)
-            pending_confirmations.pop(confirmation_id)
+            command_output = await asyncio.get_running_loop().run_in_executor(
+                agent_executor, openstack_agent.process_user_query, action_to_execute)
         else:
             # Execute the initial command
-            command_output = openstack_agent.process_user_query(user_query)
+            command_output = await run_agent_query(user_query)
 
         # Handle different response types from the agent
         if isinstance(command_output, dict):
             if command_output.get('status') == 'confirmation_required':
                 confirmation_id = str(uuid.uuid4())
                 executable_action = command_output.get('action_details', user_query)
-                pending_confirmations[confirmation_id] = executable_action
+                await save_confirmation(confirmation_id, executable_action)
                 return {
                     'status': 'confirmation_required',
                     'confirmation_id': confirmation_id,
                     'message': command_output.get('message', 'Confirmation required')
                 }
 
+        # Clients that ask for NDJSON get list results row by row instead of one buffered JSON body
+        if isinstance(command_output, list) and NDJSON in request.headers.get("accept", ""):
+            return StreamingResponse(ndjson_rows(command_output), media_type=NDJSON)
+
         return {'result': command_output}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/status")
+@app.get("/api/status", response_model=StatusResponse)
 async def get_status():
     """Get the current status of the OpenStack agent and connection."""
     api_connected = False
@@ -125,4 +286,9 @@ async def get_status():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5001)
\ No newline at end of file
+    # Development entry point; production runs `gunicorn -c gunicorn_conf.py routes:app`.
+    # Confirmations are process-local unless REDIS_URL is set, so only raise WEB_WORKERS together with Redis.
+    # Per-request access logging is off by default; set WEB_ACCESS_LOG=1 to turn it back on.
+    uvicorn.run("routes:app", host=os.getenv("WEB_HOST", "0.0.0.0"), port=int(os.getenv("WEB_PORT", "5001")),
+                workers=int(os.getenv("WEB_WORKERS", "1")),
+                access_log=os.getenv("WEB_ACCESS_LOG", "0").lower() in ("1", "true", "yes"))
\ No newline at end of file
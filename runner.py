@@ -68,17 +68,16 @@ except ImportError:
         def add_row(self, *args):
             self.rows.append(args)
         def __str__(self):
-            output = f"{self.title}\n" if self.title else ""
-            output += " | ".join(self.columns) + "\n"
-            output += "-" * (len(output) - 1) + "\n"
-            for row in self.rows:
-                output += " | ".join(str(cell) for cell in row) + "\n"
-            return output
+            # Collect the lines and join once rather than growing a string per row
+            header = " | ".join(self.columns)
+            lines = [self.title] if self.title else []
+            lines += [header, "-" * len(header)]
+            lines.extend(" | ".join(str(cell) for cell in row) for row in self.rows)
+            lines.append("")
+            return "\n".join(lines)
 
 import requests
 from agent import OpenStackAgent
-from flask import Flask, request, jsonify
-from flask_cors import CORS
 
 # Configuration management
 class ChatbotConfig:
@@ -106,6 +105,9 @@ class ChatbotConfig:
         with open("chatbot_config.json", 'w') as f:
             json.dump(config, f, indent=2)
 
+# Parses "set output format <fmt>" in the command loop
+OUTPUT_FORMAT_PATTERN = re.compile(r"format\s+(pretty|json|raw)")
+
 # Setup logging
 logging.basicConfig(filename="chatbot.log", level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
@@ -238,25 +240,26 @@ def run_cli(remote_url=None):
         try:
             user_input = Prompt.ask("\n[bold purple]➜ Command[/bold purple]", default="help")
             user_input = user_input.strip()
-            if user_input.lower() in ["exit", "quit"]:
+            lowered = user_input.lower()
+            if lowered in ["exit", "quit"]:
                 console.print(Panel(Text("Goodbye!", style="yellow"), title="Session Ended", border_style="yellow"))
                 break
-            if user_input.lower() == "help":
+            if lowered == "help":
                 display_help(config)
                 continue
-            if user_input.lower() == "tutorial":
+            if lowered == "tutorial":
                 run_tutorial(agent, config)
                 continue
-            if user_input.lower() == "history":
+            if lowered == "history":
                 console.print(Panel(Text("History feature is disabled due to removal of context.", style="yellow"), title="Info", border_style="yellow"))
                 continue
-            if user_input.lower().startswith("set verbose"):
-                config.verbose = "on" in user_input.lower()
+            if lowered.startswith("set verbose"):
+                config.verbose = "on" in lowered
                 config.save_config()
                 console.print(Text(f"Verbose mode {'enabled' if config.verbose else 'disabled'}.", style="green"))
                 continue
-            elif user_input.lower().startswith("set output format"):
-                fmt = re.search(r"format\s+(pretty|json|raw)", user_input.lower())
+            elif lowered.startswith("set output format"):
+                fmt = OUTPUT_FORMAT_PATTERN.search(lowered)
                 if fmt:
                     config.output_format = fmt.group(1)
                     config.save_config()
@@ -0,0 +1,150 @@
+"""Shared fixtures: an in-memory stand-in for mongo_db.MongoDB so FakeOpenStackAPI runs without a server."""
+
+import copy
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# agent.py exits at import without a key; the tests never reach the Gemini API
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+
+class InMemoryMongoDB:
+    """The subset of mongo_db.MongoDB that FakeOpenStackAPI uses, backed by dicts."""
+
+    def __init__(self, collections=None):
+        self.client = object()
+        self._lock = threading.Lock()
+        self.collections = {name: [copy.deepcopy(doc) for doc in docs]
+                            for name, docs in (collections or {}).items() if isinstance(docs, list)}
+        self.singletons = {name: copy.deepcopy(doc)
+                           for name, doc in (collections or {}).items() if isinstance(doc, dict)}
+        self.counters = {}
+
+    @staticmethod
+    def _matches(doc, query):
+        for key, expected in query.items():
+            if key == '$or':
+                if not any(InMemoryMongoDB._matches(doc, sub) for sub in expected):
+                    return False
+            elif key == 'attachments.server_id':
+                if not any(att.get('server_id') == expected for att in doc.get('attachments', [])):
+                    return False
+            elif doc.get(key) != expected:
+                return False
+        return True
+
+    def connect(self):
+        return True
+
+    def count(self, collection_name):
+        with self._lock:
+            if collection_name in self.singletons:
+                return 1
+            return len(self.collections.get(collection_name, []))
+
+    def find_all(self, collection_name):
+        with self._lock:
+            return [dict(doc) for doc in self.collections.get(collection_name, [])]
+
+    def find_one(self, collection_name, query):
+        with self._lock:
+            for doc in self.collections.get(collection_name, []):
+                if self._matches(doc, query):
+                    return dict(doc)
+        return None
+
+    def find_one_by_id_or_name(self, collection_name, value):
+        return self.find_one(collection_name, {'$or': [{'id': value}, {'name': value}]})
+
+    def insert_one(self, collection_name, document):
+        with self._lock:
+            self.collections.setdefault(collection_name, []).append(dict(document))
+        return document.get('id')
+
+    def insert_many(self, collection_name, documents):
+        with self._lock:
+            self.collections.setdefault(collection_name, []).extend(dict(doc) for doc in documents)
+        return len(documents)
+
+    def find_one_and_update(self, collection_name, query, update):
+        with self._lock:
+            for doc in self.collections.get(collection_name, []):
+                if self._matches(doc, query):
+                    doc.update(update)
+                    return dict(doc)
+        return None
+
+    def delete_one(self, collection_name, query):
+        with self._lock:
+            docs = self.collections.get(collection_name, [])
+            for i, doc in enumerate(docs):
+                if self._matches(doc, query):
+                    del docs[i]
+                    return True
+        return False
+
+    def delete_many(self, collection_name, query):
+        with self._lock:
+            docs = self.collections.get(collection_name, [])
+            kept = [doc for doc in docs if not self._matches(doc, query)]
+            self.collections[collection_name] = kept
+            return len(docs) - len(kept)
+
+    def get_singleton(self, collection_name):
+        with self._lock:
+            return copy.deepcopy(self.singletons.get(collection_name))
+
+    def set_singleton(self, collection_name, document):
+        with self._lock:
+            self.singletons[collection_name] = copy.deepcopy(document)
+        return True
+
+    def find_singleton_element(self, collection_name, field, value):
+        with self._lock:
+            for entry in (self.singletons.get(collection_name) or {}).get(field, []):
+                if entry.get('id') == value or entry.get('name') == value:
+                    return dict(entry)
+        return None
+
+    def seed_sequence(self, name, floor):
+        with self._lock:
+            self.counters[name] = max(self.counters.get(name, 0), floor)
+        return True
+
+    def next_sequence(self, name):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            return self.counters[name]
+
+
+SEED_DATA = {
+    'servers': [
+        {'id': 'srv-1', 'name': 'web1', 'status': 'ACTIVE', 'flavor': {'id': 'flv-1'},
+         'image': {'id': 'img-1'}, 'networks': {'private-net': ['192.168.1.100']}},
+    ],
+    'images': [{'id': 'img-1', 'name': 'Ubuntu-20.04'}],
+    'flavors': [{'id': 'flv-1', 'name': 'm1.small'}, {'id': 'flv-2', 'name': 'm1.medium'}],
+    'networks': [{'id': 'net-1', 'name': 'private-net'}],
+    'volumes': [{'id': 'vol-1', 'name': 'data', 'status': 'available', 'size': 10, 'attachments': []}],
+    'usage': {'project_usage': {}, 'servers_usage': [{'id': 'srv-1', 'name': 'web1'}]},
+}
+
+
+@pytest.fixture
+def mongo():
+    return InMemoryMongoDB(SEED_DATA)
+
+
+@pytest.fixture
+def fake_api(monkeypatch, mongo):
+    """A FakeOpenStackAPI whose MongoDB is the in-memory stand-in."""
+    fake_api_module = pytest.importorskip("fake_api")
+    monkeypatch.setattr(fake_api_module, "MongoDB", lambda: mongo)
+    return fake_api_module.FakeOpenStackAPI()
@@ -0,0 +1,91 @@
+"""OpenStackAgent's short-lived cache of read-only query results."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+agent_module = pytest.importorskip("agent")
+
+INTENTS = {
+    "list servers": "list_servers",
+    "show details of server Prod": "get_usage",
+    "show details of server prod": "get_usage",
+    "delete server web1": "delete_server",
+}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """An OpenStackAgent with the LLM layers and the backend replaced by counters."""
+    agent = agent_module.OpenStackAgent.__new__(agent_module.OpenStackAgent)
+    agent.api_methods = {name: {'params': {}} for name in INTENTS.values()}
+    agent.default_params_map = {}
+    agent._query_cache = {}
+    agent._query_cache_lock = threading.Lock()
+    agent.executed = []
+    agent._generate_initial_command_with_ai = lambda query: {'function_name': INTENTS[query], 'parameters': {}}
+    agent._validate_command_with_ai = lambda query, intent: {'is_valid': True}
+
+    def execute_command(command):
+        agent.executed.append(command['function_name'])
+        return f"{command['function_name']} #{len(agent.executed)}"
+    agent.execute_command = execute_command
+    monkeypatch.setattr(agent_module, "QUERY_CACHE_TTL", 10)
+    return agent
+
+
+def test_repeated_read_query_is_served_from_cache(agent):
+    first = agent.process_user_query("list servers")
+    second = agent.process_user_query("list  servers")
+
+    assert second == first
+    assert agent.executed == ["list_servers"]
+
+
+@pytest.mark.parametrize("failure", [None, "Error: Execution failed - timeout", "Error: Failed to connect to OpenStack."])
+def test_failed_reads_are_not_cached(agent, failure):
+    outcomes = [failure, "list_servers ok"]
+
+    def execute_command(command):
+        agent.executed.append(command['function_name'])
+        return outcomes[len(agent.executed) - 1]
+    agent.execute_command = execute_command
+
+    assert agent.process_user_query("list servers") == failure
+    assert agent.process_user_query("list servers") == "list_servers ok"
+    assert agent.process_user_query("list servers") == "list_servers ok"
+    assert agent.executed == ["list_servers", "list_servers"]
+
+
+def test_cache_key_keeps_case(agent):
+    agent.process_user_query("show details of server Prod")
+    agent.process_user_query("show details of server prod")
+
+    assert agent.executed == ["get_usage", "get_usage"]
+
+
+def test_write_invalidates_cached_reads(agent):
+    agent.process_user_query("list servers")
+    agent.process_user_query("delete server web1")
+    agent.process_user_query("list servers")
+
+    assert agent.executed == ["list_servers", "delete_server", "list_servers"]
+
+
+def test_cached_reads_expire(agent, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(agent_module.time, "monotonic", lambda: now[0])
+    agent.process_user_query("list servers")
+    now[0] += 11
+    agent.process_user_query("list servers")
+
+    assert agent.executed == ["list_servers", "list_servers"]
+
+
+def test_ttl_zero_disables_the_cache(agent, monkeypatch):
+    monkeypatch.setattr(agent_module, "QUERY_CACHE_TTL", 0)
+    agent.process_user_query("list servers")
+    agent.process_user_query("list servers")
+
+    assert agent.executed == ["list_servers", "list_servers"]
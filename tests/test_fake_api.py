@@ -0,0 +1,102 @@
+"""FakeOpenStackAPI in-memory indexes, concurrency and fake IP allocation."""
+
+import threading
+
+import pytest
+
+fake_api_module = pytest.importorskip("fake_api")
+
+
+def assert_indexes_consistent(api, collection_name):
+    docs = getattr(api, collection_name)
+    positions = api._positions[collection_name]
+    assert len(positions) == len(docs)
+    for position, doc in enumerate(docs):
+        assert positions[id(doc)] == position
+        assert api._by_id[collection_name][doc['id']] is doc
+        assert doc in api._by_name[collection_name][doc['name']]
+    assert sum(len(named) for named in api._by_name[collection_name].values()) == len(docs)
+
+
+def test_create_and_delete_keep_indexes_consistent(fake_api):
+    created = [fake_api.create_server(f"vm-{i}", 'Ubuntu-20.04', 'm1.small', 'private-net') for i in range(5)]
+    assert all(created)
+    assert fake_api.delete_server('vm-2')
+    assert fake_api.delete_server(created[0]['id'])
+
+    assert {srv['name'] for srv in fake_api.servers} == {'web1', 'vm-1', 'vm-3', 'vm-4'}
+    assert_indexes_consistent(fake_api, 'servers')
+
+
+def test_index_remove_ignores_documents_already_removed(fake_api):
+    server = fake_api._lookup('servers', 'web1')
+    fake_api._index_remove('servers', server)
+    fake_api._index_remove('servers', server)
+
+    assert fake_api.servers == []
+    assert_indexes_consistent(fake_api, 'servers')
+
+
+def test_concurrent_deletes_and_lists_do_not_corrupt_indexes(fake_api):
+    names = [f"vm-{i}" for i in range(60)]
+    for name in names:
+        assert fake_api.create_server(name, 'Ubuntu-20.04', 'm1.small', 'private-net', volume_size=1)
+
+    errors = []
+    start = threading.Barrier(8)
+
+    def worker(job):
+        start.wait()
+        try:
+            job()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    def delete_all():
+        # Two threads delete every server, so each delete races another delete of the same server
+        for name in names:
+            fake_api.delete_server(name)
+
+    def list_repeatedly():
+        for _ in range(30):
+            fake_api.list_servers()
+            fake_api.list_volumes()
+
+    threads = [threading.Thread(target=worker, args=(job,))
+               for job in [delete_all] * 4 + [list_repeatedly] * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [srv['name'] for srv in fake_api.list_servers()] == ['web1']
+    assert [vol['name'] for vol in fake_api.list_volumes()] == ['data']
+    assert_indexes_consistent(fake_api, 'servers')
+    assert_indexes_consistent(fake_api, 'volumes')
+
+
+def test_list_returns_a_snapshot(fake_api):
+    listed = fake_api.list_servers()
+    fake_api.create_server('vm-new', 'Ubuntu-20.04', 'm1.small', 'private-net')
+
+    assert [srv['name'] for srv in listed] == ['web1']
+
+
+@pytest.mark.parametrize("sequence, ip", [
+    (1, '192.168.1.100'),
+    (254, '192.168.254.100'),
+    (255, '192.168.1.101'),
+    (509, '192.168.1.102'),
+])
+def test_server_ip_stays_valid_past_254(sequence, ip):
+    assert fake_api_module._server_ip(sequence) == ip
+    assert fake_api_module._ip_sequence(ip) == sequence
+
+
+def test_new_server_ips_continue_after_the_highest_assigned(fake_api, mongo):
+    mongo.counters['server_ip'] = 254
+    server = fake_api.create_server('vm-255', 'Ubuntu-20.04', 'm1.small', 'private-net')
+
+    stored = fake_api._lookup('servers', server['id'])
+    assert stored['networks'] == {'private-net': ['192.168.1.101']}
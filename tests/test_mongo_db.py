@@ -0,0 +1,99 @@
+"""MongoDB.connect (one ping per instance, indexes once per process) and the find_all cache."""
+
+import bson
+import pytest
+
+mongo_db = pytest.importorskip("mongo_db")
+
+
+class RecordingCollection:
+    def __init__(self, calls):
+        self.calls = calls
+        self.docs = []
+        self.during_read = None
+
+    def create_indexes(self, models):
+        self.calls.append('create_indexes')
+
+    def create_index(self, keys):
+        self.calls.append('create_index')
+
+    def find_raw_batches(self, query, projection):
+        self.calls.append('find')
+        snapshot = [bson.encode(doc) for doc in self.docs]
+        if self.during_read:
+            self.during_read()
+        return [b''.join(snapshot)]
+
+    def insert_one(self, document):
+        self.docs.append(document)
+        return type('InsertOneResult', (), {'inserted_id': len(self.docs), 'acknowledged': True})()
+
+
+class RecordingDatabase:
+    def __init__(self, calls):
+        self.calls = calls
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, RecordingCollection(self.calls))
+
+
+class RecordingClient:
+    def __init__(self):
+        self.calls = []
+        self.admin = self
+
+    def command(self, name):
+        self.calls.append(name)
+
+    def get_database(self, name, codec_options=None):
+        return RecordingDatabase(self.calls)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = RecordingClient()
+    monkeypatch.setattr(mongo_db, "_get_client", lambda: client)
+    monkeypatch.setattr(mongo_db, "_indexes_ensured", False)
+    return client
+
+
+def test_connect_is_a_noop_once_connected(client):
+    db = mongo_db.MongoDB()
+    handle = db.get_collection('servers')
+    calls_after_init = list(client.calls)
+
+    assert db.connect()
+    assert client.calls == calls_after_init
+    assert db.get_collection('servers') is handle
+
+
+def test_indexes_are_created_once_per_process(client):
+    mongo_db.MongoDB()
+    mongo_db.MongoDB()
+
+    assert client.calls.count('ping') == 2
+    assert client.calls.count('create_indexes') == len(mongo_db.INDEXED_COLLECTIONS)
+    assert client.calls.count('create_index') == 1
+
+
+def test_find_all_is_cached_until_a_write(client):
+    db = mongo_db.MongoDB()
+    db.insert_one('servers', {'id': 'a'})
+
+    assert db.find_all('servers') == db.find_all('servers') == [{'id': 'a'}]
+    assert client.calls.count('find') == 1
+    db.insert_one('servers', {'id': 'b'})
+    assert db.find_all('servers') == [{'id': 'a'}, {'id': 'b'}]
+    assert client.calls.count('find') == 2
+
+
+def test_find_all_overlapping_a_write_is_not_cached(client):
+    db = mongo_db.MongoDB()
+    servers = db.get_collection('servers')
+    servers.during_read = lambda: db.insert_one('servers', {'id': 'late'})
+
+    assert db.find_all('servers') == []
+    servers.during_read = None
+    assert db.find_all('servers') == [{'id': 'late'}]
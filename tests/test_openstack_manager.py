@@ -0,0 +1,59 @@
+"""create_full_stack: the network and data volume are rolled back when the server can't be created."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("openstack")
+openstack_manager = pytest.importorskip("openstack_manager")
+
+NETWORK = SimpleNamespace(id='net-1')
+SUBNET = SimpleNamespace(id='sub-1')
+VOLUME = SimpleNamespace(id='vol-1')
+SERVER = SimpleNamespace(id='srv-1')
+SPEC = {'name': 'web', 'image': 'Ubuntu-20.04', 'flavor': 'm1.small', 'data_volume_size': 10}
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setattr(openstack_manager, "_resolve_id", lambda kind, finder, name: f"{kind}-id")
+    monkeypatch.setattr(openstack_manager, "create_network_with_subnet", lambda conn, name, cidr: (NETWORK, SUBNET))
+    monkeypatch.setattr(openstack_manager, "create_volume", lambda *args: VOLUME)
+    monkeypatch.setattr(openstack_manager, "_wait_for_status", lambda fetch, resource, *args: resource)
+    return MagicMock()
+
+
+def test_server_failure_rolls_back_network_and_volume(conn, monkeypatch):
+    monkeypatch.setattr(openstack_manager, "create_server", lambda *args, **kwargs: None)
+
+    result = openstack_manager.create_full_stack(conn, SPEC)
+
+    assert result == {'network': None, 'subnet': None, 'volume': None, 'server': None}
+    conn.block_storage.delete_volume.assert_called_once_with(VOLUME, ignore_missing=True)
+    conn.network.delete_subnet.assert_called_once_with(SUBNET, ignore_missing=True)
+    conn.network.delete_network.assert_called_once_with(NETWORK, ignore_missing=True)
+
+
+def test_network_failure_rolls_back_volume(conn, monkeypatch):
+    monkeypatch.setattr(openstack_manager, "create_network_with_subnet", lambda conn, name, cidr: (None, None))
+    create_server = MagicMock()
+    monkeypatch.setattr(openstack_manager, "create_server", create_server)
+
+    result = openstack_manager.create_full_stack(conn, SPEC)
+
+    assert result['volume'] is None
+    create_server.assert_not_called()
+    conn.block_storage.delete_volume.assert_called_once_with(VOLUME, ignore_missing=True)
+    conn.network.delete_network.assert_not_called()
+
+
+def test_success_keeps_everything_and_attaches_the_volume(conn, monkeypatch):
+    monkeypatch.setattr(openstack_manager, "create_server", lambda *args, **kwargs: SERVER)
+
+    result = openstack_manager.create_full_stack(conn, SPEC)
+
+    assert result == {'network': NETWORK, 'subnet': SUBNET, 'volume': VOLUME, 'server': SERVER}
+    conn.compute.create_volume_attachment.assert_called_once_with(SERVER, volume_id='vol-1')
+    conn.block_storage.delete_volume.assert_not_called()
+    conn.network.delete_network.assert_not_called()
@@ -0,0 +1,113 @@
+"""routes.py request coalescing, the pending-confirmation store and response shapes."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+routes = pytest.importorskip("routes")
+
+
+class SlowAgent:
+    """Counts process_user_query calls; each one takes long enough for callers to overlap."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def process_user_query(self, user_query):
+        with self._lock:
+            self.calls.append(user_query)
+        time.sleep(0.05)
+        return f"result for {user_query}"
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = SlowAgent()
+    monkeypatch.setattr(routes, "openstack_agent", agent)
+    return agent
+
+
+def run_concurrently(*queries):
+    async def main():
+        return await asyncio.gather(*(routes.run_agent_query(query) for query in queries))
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("query, key", [
+    ("list servers", "list servers"),
+    ("  list   servers ", "list servers"),
+    ("show details of server Prod", "show details of server Prod"),
+    ("show usage", "show usage"),
+    ("delete server Web1", None),
+    ("create a server named web", None),
+    ("resize server web1 to m1.large", None),
+    ("list servers and delete web1", None),
+])
+def test_coalescing_key(query, key):
+    assert routes.coalescing_key(query) == key
+
+
+def test_identical_read_queries_share_one_call(agent):
+    results = run_concurrently(*["list servers"] * 5)
+
+    assert agent.calls == ["list servers"]
+    assert results == ["result for list servers"] * 5
+    assert routes.in_flight_queries == {}
+
+
+def test_read_queries_differing_in_case_are_not_merged(agent):
+    run_concurrently("show details of server Prod", "show details of server prod")
+
+    assert sorted(agent.calls) == ["show details of server Prod", "show details of server prod"]
+
+
+def test_mutating_queries_always_run(agent):
+    run_concurrently(*["delete server web1"] * 3)
+
+    assert agent.calls == ["delete server web1"] * 3
+
+
+def test_confirmation_is_taken_only_once(monkeypatch):
+    monkeypatch.setattr(routes, "confirmation_store", None)
+    monkeypatch.setattr(routes, "pending_confirmations", routes.PendingConfirmations(maxsize=8, ttl=60))
+
+    async def main():
+        await routes.save_confirmation("abc", {"function_name": "delete_server"})
+        return await routes.take_confirmation("abc"), await routes.take_confirmation("abc")
+
+    assert asyncio.run(main()) == ({"function_name": "delete_server"}, None)
+
+
+def test_pending_confirmations_expire_and_stay_bounded(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(routes.time, "monotonic", lambda: now[0])
+    store = routes.PendingConfirmations(maxsize=2, ttl=10)
+    store["a"] = 1
+    store["b"] = 2
+    store["c"] = 3
+
+    assert "a" not in store
+    now[0] += 11
+    assert "b" not in store and "c" not in store
+
+
+def test_command_response_keeps_only_the_fields_set(agent):
+    from fastapi.testclient import TestClient
+
+    response = TestClient(routes.app).post("/api/command", json={"query": "list servers"})
+
+    assert response.status_code == 200
+    assert response.json() == {"result": "result for list servers"}
+
+
+def test_status_response(monkeypatch):
+    from fastapi.testclient import TestClient
+    monkeypatch.setattr(routes, "openstack_agent", None)
+
+    response = TestClient(routes.app).get("/api/status")
+
+    assert response.json() == {"status": "error", "agent_initialized": False, "openstack_connected": False}